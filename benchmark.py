@@ -0,0 +1,172 @@
+from maze import Maze
+from maze.Maze import N, S, E, W
+from generators import Kruskal, Prim, Wilson
+from solvers import ASolver, BatchBFSSolver, DijkstraSolver
+from utils.create_dataset import create_maze, get_sample_rng, maze_to_npy, path_to_npy
+
+import argparse
+import heapq
+import numpy as np
+
+import time
+
+
+def open_maze(size, max_cost, seed=0):
+    """
+    Create a size x size maze without interior walls, with random integer costs in [1, max_cost].
+
+    Args:
+        size (int): The size of the maze.
+        max_cost (int): The maximum cost of entering a cell.
+        seed (int): The seed for the random costs.
+
+    Returns:
+        Maze: The weighted maze, from the top-left to the bottom-right corner.
+    """
+    costs = np.random.default_rng(seed).integers(1, max_cost + 1, size=(size, size))
+    maze = Maze(size, size, costs=costs)
+    maze.grid &= ~np.uint8(N | S | E | W)
+    maze.grid[0, :] |= N
+    maze.grid[-1, :] |= S
+    maze.grid[:, -1] |= E
+    maze.grid[:, 0] |= W
+    return maze
+
+
+def heap_dijkstra(maze):
+    """
+    Reference Dijkstra with a binary heap, using the same cell ids and relaxation as DijkstraSolver.
+
+    Args:
+        maze (Maze): The maze to solve.
+
+    Returns:
+        int: The distance from the start cell to the target cell.
+    """
+    cols = maze.cols
+    start_id = maze.start_indices[0] * cols + maze.start_indices[1]
+    target_id = maze.target_indices[0] * cols + maze.target_indices[1]
+    walls = maze.grid.ravel().tolist()
+    costs = maze.costs.ravel().tolist()
+    moves = ((-cols, N), (cols, S), (1, E), (-1, W))
+
+    distances = [-1] * len(walls)
+    came_from = [-1] * len(walls)
+    settled = [False] * len(walls)
+    distances[start_id] = 0
+    heap = [(0, start_id)]
+    while heap:
+        distance, current_id = heapq.heappop(heap)
+        if settled[current_id]:
+            continue
+        settled[current_id] = True
+        if current_id == target_id:
+            return distance
+        current_walls = walls[current_id]
+        for offset, wall in moves:
+            if current_walls & wall:
+                continue
+            neighbor_id = current_id + offset
+            if settled[neighbor_id]:
+                continue
+            tentative_distance = distance + costs[neighbor_id]
+            neighbor_distance = distances[neighbor_id]
+            if neighbor_distance >= 0 and tentative_distance >= neighbor_distance:
+                continue
+            distances[neighbor_id] = tentative_distance
+            came_from[neighbor_id] = current_id
+            heapq.heappush(heap, (tentative_distance, neighbor_id))
+
+
+def benchmark_solvers(sizes, max_cost, repeats):
+    """
+    Compare the bucket-queue DijkstraSolver with a binary-heap Dijkstra on weighted open grids.
+    """
+    print(f'{"size":>6} {"bucket (s)":>12} {"heap (s)":>12} {"speedup":>8}')
+    for size in sizes:
+        maze = open_maze(size, max_cost)
+        solver = DijkstraSolver()
+
+        bucket_times, heap_times = [], []
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            path = solver.solve(maze)
+            bucket_times.append(time.perf_counter() - start_time)
+
+            start_time = time.perf_counter()
+            distance = heap_dijkstra(maze)
+            heap_times.append(time.perf_counter() - start_time)
+
+        # Both solvers must agree on the shortest distance
+        assert sum(maze.costs[cell.row, cell.col] for cell in path[1:]) == distance
+
+        bucket_time, heap_time = min(bucket_times), min(heap_times)
+        print(f'{size:>6} {bucket_time:>12.4f} {heap_time:>12.4f} {heap_time / bucket_time:>7.2f}x')
+
+
+def benchmark_generators(sizes, repeats):
+    """
+    Compare the Kruskal, Prim and Wilson generators on square mazes.
+    """
+    generators = {'Kruskal': Kruskal(), 'Prim': Prim(), 'Wilson': Wilson()}
+    print(f'{"size":>6}' + ''.join(f'{name + " (s)":>14}' for name in generators))
+    for size in sizes:
+        times = []
+        for generator in generators.values():
+            generator_times = []
+            for _ in range(repeats):
+                start_time = time.perf_counter()
+                Maze(size, size, generator=generator)
+                generator_times.append(time.perf_counter() - start_time)
+            times.append(min(generator_times))
+        print(f'{size:>6}' + ''.join(f'{generator_time:>14.4f}' for generator_time in times))
+
+
+def benchmark_batch_solvers(sizes, batch_size, repeats):
+    """
+    Compare the throughput of BatchBFSSolver on a stack of pixel mazes with ASolver on the same mazes, one at a time.
+    """
+    print(f'{"size":>6} {"batch (mazes/s)":>16} {"A* (mazes/s)":>14} {"speedup":>8}')
+    for size in sizes:
+        mazes = [create_maze(size, Wilson(), get_sample_rng(0, i)) for i in range(batch_size)]
+        arrays, holes = zip(*(maze_to_npy(maze, return_holes=True) for maze in mazes))
+        arrays, holes = np.stack(arrays), np.array(holes)
+        batch_solver, solver = BatchBFSSolver(), ASolver()
+
+        batch_times, solver_times = [], []
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            batch_paths = batch_solver.solve(arrays, holes)
+            batch_times.append(time.perf_counter() - start_time)
+
+            start_time = time.perf_counter()
+            paths = [path_to_npy(solver.solve(maze), array, list(map(tuple, maze_holes)))
+                     for maze, array, maze_holes in zip(mazes, arrays, holes)]
+            solver_times.append(time.perf_counter() - start_time)
+
+        # Both solvers must find the same (unique) paths
+        assert (batch_paths == np.stack(paths)).all()
+
+        batch_rate, solver_rate = batch_size / min(batch_times), batch_size / min(solver_times)
+        print(f'{size:>6} {batch_rate:>16.0f} {solver_rate:>14.0f} {batch_rate / solver_rate:>7.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the maze solvers and generators.')
+    parser.add_argument('--suite', type=str, default='solvers', choices=['solvers', 'generators', 'batch'], help='The benchmark to run.')
+    parser.add_argument('--sizes', '-s', type=int, nargs='+', default=None, help='The maze sizes to benchmark. Defaults to 128-1024 for the solvers, 64-1024 for the generators and 8-64 for the batch solvers.')
+    parser.add_argument('--max-cost', '-c', type=int, default=9, help='The maximum cost of entering a cell.')
+    parser.add_argument('--batch-size', '-b', type=int, default=256, help='The number of mazes per batch for the batch suite.')
+    parser.add_argument('--repeats', '-r', type=int, default=3, help='The number of repeats per size (the best time is reported).')
+
+    args = parser.parse_args()
+
+    if args.suite == 'solvers':
+        benchmark_solvers(args.sizes or [128, 256, 512, 1024], args.max_cost, args.repeats)
+    elif args.suite == 'generators':
+        benchmark_generators(args.sizes or [64, 128, 256, 512, 1024], args.repeats)
+    else:
+        benchmark_batch_solvers(args.sizes or [8, 16, 32, 64], args.batch_size, args.repeats)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from utils import *
 from maze import Maze
-from generators import RandomizedDFS, Wilson, FractalTessellation, Prim
+from generators import RandomizedDFS, Wilson, FractalTessellation, Prim, Kruskal, BinaryTree, Sidewinder, Eller
 
 import argparse
 import numpy as np
@@ -8,25 +8,61 @@ import numpy as np
 import time
 
 
+def get_generator(name, bias=0.5, n_tiles=None):
+    """
+    Get the maze generator for a --generator choice.
+
+    Args:
+        name (str): The name of the generator.
+        bias (float): The bias for the RandomizedDFS generator.
+        n_tiles (int): The number of tiling steps for the FractalTessellation generator.
+
+    Returns:
+        IGenerator: The maze generator.
+    """
+    generator_dict = {'RandomizedDFS': RandomizedDFS(bias=bias), 'Wilson': Wilson(), 'FractalTessellation': FractalTessellation(n_tiles), 'Prim': Prim(), 'Kruskal': Kruskal(),
+                      'BinaryTree': BinaryTree(), 'Sidewinder': Sidewinder(), 'Eller': Eller()}
+    return generator_dict[name]
+
+
 def main():
     parser = argparse.ArgumentParser(description='Create datasets for the maze solver.')
     parser.add_argument('--maze-size', '-s', type=int, default=64, help='The size in the maze.')
     parser.add_argument('--num-mazes', '-n', type=int, default=10, help='The number of mazes to generate.')
     parser.add_argument('--generator', '-g', type=str, default='Wilson', help='The maze generator to use.',
-                        choices=['RandomizedDFS', 'Wilson', 'FractalTessellation', 'Prim'], 
+                        choices=['RandomizedDFS', 'Wilson', 'FractalTessellation', 'Prim', 'Kruskal', 'BinaryTree', 'Sidewinder', 'Eller'], 
                         ) # map to the class
     parser.add_argument('--output', '-o', type=str, default='datasets/dataset.npy', help='The output file to save the dataset to.')
     parser.add_argument('--bias', '-b', type=float, default=0.5, help='The bias for the RandomizedDFS generator.')
-    parser.add_argument('--n-tiles', '-nt', type=int, default=6, help='The number of tiling steps for the FractalTessellation generator.')
+    parser.add_argument('--n-tiles', '-nt', type=int, default=None, help='The number of tiling steps for the FractalTessellation generator. Defaults to log2 of the maze size.')
+    parser.add_argument('--chunk-size', '-c', type=int, default=1024, help='The number of samples to generate before appending them to the output file.')
+    parser.add_argument('--seed', type=int, default=None, help='The root seed of the dataset, to make every sample reproducible from its index. Defaults to the global np.random state.')
+    parser.add_argument('--pairs-per-maze', '-k', type=int, default=1, help='The number of distinct start/target pairs (samples) per generated maze.')
+    parser.add_argument('--workers', '-w', type=int, default=1, help='The number of worker processes. With more than 1, samples are created by a pipeline of workers and a writer thread.')
+    parser.add_argument('--compact', action='store_true', help='Save the dataset in the bit-packed compact format (.npz), see utils.CompactDataset.')
 
     args = parser.parse_args()
 
-    generator_dict = {'RandomizedDFS': RandomizedDFS(bias=args.bias), 'Wilson': Wilson(), 'FractalTessellation': FractalTessellation(args.n_tiles), 'Prim': Prim()}
+    generator = get_generator(args.generator, args.bias, args.n_tiles)
+
+    if args.compact and args.workers > 1:
+        parser.error('--compact is not supported with --workers > 1.')
 
     start_time = time.time()
-    dataset = create_dataset(args.num_mazes, args.maze_size, generator_dict[args.generator])
-    # save the dataset
-    np.save(args.output, dataset)
+    chunks = iter_dataset(args.num_mazes, args.maze_size, generator, chunk_size=args.chunk_size, seed=args.seed, pairs_per_maze=args.pairs_per_maze)
+    if args.compact:
+        save_compact(args.output, chunks)
+    else:
+        # stream the dataset to the output file, one chunk at a time
+        pixels = 2 * args.maze_size + 1
+        with DatasetWriter(args.output, (2, pixels, pixels)) as writer:
+            if args.workers > 1:
+                seed = write_dataset(writer, args.num_mazes, args.maze_size, generator, args.workers, args.chunk_size, args.seed,
+                                     pairs_per_maze=args.pairs_per_maze)
+                print(f'Seed: {seed}')
+            else:
+                for chunk in chunks:
+                    writer.append(chunk)
 
     end_time = time.time()
 
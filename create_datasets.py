@@ -1,56 +1,102 @@
-import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import argparse
 import numpy as np
-import time
 import os
+import time
 
 from utils import *
+from create_dataset import get_generator
+
+
+def fill_shard(directory, shard, start, stop, maze_size, generator, seed, pairs_per_maze=1):
+    """
+    Create the samples start..stop-1 of the dataset as one shard, in a worker process.
+
+    The shard is written to a temporary file, and only renamed to its final name when it is complete.
+
+    Args:
+        directory (str): The directory of the sharded dataset.
+        shard (int): The index of the shard.
+        start (int): The index of the first sample.
+        stop (int): The index after the last sample.
+        maze_size (int): The size of the maze.
+        generator (IGenerator): The maze generator to use.
+        seed (int): The root seed of the dataset. Sample i only depends on the root seed and i (see get_sample_rng).
+        pairs_per_maze (int): The number of start/target pairs per maze, see iter_pair_samples.
+
+    Returns:
+        str: The checksum of the shard file.
+    """
+    path = get_shard_path(directory, shard)
+    pixels = 2 * maze_size + 1
+    dataset = np.lib.format.open_memmap(path + '.tmp', mode='w+', dtype=np.uint8, shape=(stop - start, 2, pixels, pixels))
+    create_dataset(stop - start, maze_size, generator, out=dataset, seed=seed, start=start, pairs_per_maze=pairs_per_maze, progress=False)
+    dataset.flush()
+    del dataset
+    os.replace(path + '.tmp', path)
+    return get_checksum(path)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Create datasets for the maze solver.')
     parser.add_argument('--maze-size', '-s', type=int, default=64, help='The size in the maze.')
-    parser.add_argument('--num-mazes-per-process', '-n', type=int, default=10, help='The number of mazes to generate.')
+    parser.add_argument('--num-mazes-per-process', '-n', type=int, default=10, help='The number of mazes to generate per process.')
+    parser.add_argument('--num-mazes', type=int, default=None, help='The total number of mazes to generate. Overrides --num-mazes-per-process.')
     parser.add_argument('--generator', '-g', type=str, default='Wilson', help='The maze generator to use.',
-                        choices=['RandomizedDFS', 'Wilson', 'FractalTessellation', 'Prim'], 
+                        choices=['RandomizedDFS', 'Wilson', 'FractalTessellation', 'Prim', 'Kruskal', 'BinaryTree', 'Sidewinder', 'Eller'], 
                         ) # map to the class
-    parser.add_argument('--output', '-o', type=str, default='datasets/dataset.npy', help='The output file to save the dataset to.')
+    parser.add_argument('--output', '-o', type=str, default='datasets/dataset', help='The output directory to save the dataset shards and manifest to.')
     parser.add_argument('--processes', '-p', type=int, default=1, help='The number of processes to use. Default is 1.')
     parser.add_argument('--bias', '-b', type=float, default=0.5, help='The bias for the RandomizedDFS generator.')
-    parser.add_argument('--n-tiles', '-nt', type=int, default=6, help='The number of tiling steps for the FractalTessellation generator.')
+    parser.add_argument('--n-tiles', '-nt', type=int, default=None, help='The number of tiling steps for the FractalTessellation generator. Defaults to log2 of the maze size.')
+    parser.add_argument('--seed', type=int, default=None, help='The root seed of the dataset. Defaults to the seed in the manifest, or a fresh seed.')
+    parser.add_argument('--pairs-per-maze', '-k', type=int, default=1, help='The number of distinct start/target pairs (samples) per generated maze.')
+    parser.add_argument('--shard-size', type=int, default=10000, help='The number of samples per shard.')
 
     args = parser.parse_args()
 
     start_time = time.time()
 
-    processes = []
-
-    for i in range(args.processes):
-        p = subprocess.Popen(['python', 'create_dataset.py', 
-                          '--maze-size', str(args.maze_size), 
-                          '--num-mazes', str(args.num_mazes_per_process), 
-                          '--generator', args.generator, 
-                          '--bias', str(args.bias),
-                          '--n-tiles', str(args.n_tiles),
-                          '--output', f'datasets/dataset_{i}.npy'])
-        
-        processes.append(p)
-    
-    z = [p.wait() for p in processes]
+    num_mazes = args.num_mazes if args.num_mazes is not None else args.num_mazes_per_process * args.processes
+    generator = get_generator(args.generator, args.bias, args.n_tiles)
 
-    end_time = time.time()
+    # Resume from the manifest, if the same dataset was (partially) created before
+    os.makedirs(args.output, exist_ok=True)
+    manifest = load_manifest(args.output)
+    seed = args.seed if args.seed is not None else manifest['config']['seed'] if manifest else np.random.SeedSequence().entropy
+    config = {'maze_size': args.maze_size, 'num_mazes': num_mazes, 'generator': args.generator, 'bias': args.bias,
+              'n_tiles': args.n_tiles, 'pairs_per_maze': args.pairs_per_maze, 'shard_size': args.shard_size, 'seed': seed}
+    if manifest is None:
+        manifest = {'config': config, 'shards': {}}
+    elif manifest['config'] != config:
+        raise SystemExit(f'{args.output} holds a dataset with a different config: {manifest["config"]}')
+    print(f'Seed: {seed}')
 
-    print(f'Time taken to create dataset: {end_time - start_time:.2f} seconds.')
+    # Skip the shards that are complete and intact
+    bounds = list(range(0, num_mazes, args.shard_size)) + [num_mazes]
+    todo = []
+    for shard, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+        done = manifest['shards'].get(str(shard))
+        path = get_shard_path(args.output, shard)
+        if done is not None and os.path.exists(path) and get_checksum(path) == done['checksum']:
+            continue
+        manifest['shards'].pop(str(shard), None)
+        todo.append((shard, start, stop))
+    save_manifest(args.output, manifest)
+    print(f'Creating {len(todo)} of {len(bounds) - 1} shards.')
 
-    # concatenate the datasets
-    datasets = [np.load(f'datasets/dataset_{i}.npy') for i in range(args.processes)]
-    dataset = np.concatenate(datasets, axis=0)
-    # save the dataset
-    np.save(args.output, dataset)
+    with ProcessPoolExecutor(args.processes) as pool:
+        futures = {pool.submit(fill_shard, args.output, shard, start, stop, args.maze_size, generator, seed, args.pairs_per_maze): (shard, start, stop)
+                   for shard, start, stop in todo}
+        # record every shard as soon as it is done, so an interrupted job only loses the shards in progress
+        for future in as_completed(futures):
+            shard, start, stop = futures[future]
+            manifest['shards'][str(shard)] = {'start': start, 'stop': stop, 'checksum': future.result()}
+            save_manifest(args.output, manifest)
 
-    # remove the temporary datasets
-    for i in range(args.processes):
-        os.remove(f'datasets/dataset_{i}.npy')
+    end_time = time.time()
+
+    print(f'Time taken to create dataset: {end_time - start_time:.2f} seconds.')
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
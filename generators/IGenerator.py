@@ -1,12 +1,41 @@
 from abc import ABC, abstractmethod
+from maze.Maze import Maze, WALLS
+
+import numpy as np
 
 class IGenerator(ABC):
+    # True if generate_batch is implemented natively (vectorized over the batch), instead of looping over generate
+    vectorized:bool = False
+
     @abstractmethod
-    def generate(self, maze) -> None:
+    def generate(self, maze, rng=None) -> None:
         """
-        Generate method that updates the cells of a maze in-place (via updating Cell.visited and Cell.walls attributes).
+        Generate method that updates the cells of a maze in-place (via updating the wall and visited bits of Maze.grid, directly or through Cell views).
 
         Args:
             maze; (Maze object): The maze instance to update.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
+        """
+        pass
+
+    def generate_batch(self, n:int, rows:int, cols:int, rng=None) -> np.ndarray:
+        """
+        Generate a batch of mazes, as a stack of wall bitmasks (the N/S/E/W bits of Maze.grid).
+
+        The default implementation generates the mazes one by one with generate.
+        Generators that can work on the whole batch at once override it (and set vectorized to True).
+
+        Args:
+            n; (int): The number of mazes to generate.
+            rows; (int): The number of rows of each maze.
+            cols; (int): The number of columns of each maze.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
+
+        Returns:
+            np.ndarray: The (n, rows, cols) uint8 wall bitmasks.
         """
-        pass
\ No newline at end of file
+        walls = np.empty((n, rows, cols), dtype=np.uint8)
+        for i in range(n):
+            maze = Maze(rows, cols, generator=self, rng=rng)
+            walls[i] = maze.grid & WALLS
+        return walls
\ No newline at end of file
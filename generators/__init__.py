@@ -2,5 +2,10 @@ from .randomized_DFS import RandomizedDFS
 from .wilson import Wilson
 from.fractal_tessellation import FractalTessellation
 from .prim import Prim
+from .kruskal import Kruskal
+from .binary_tree import BinaryTree
+from .sidewinder import Sidewinder
+from .eller import Eller
+from .tiled import Tiled
 
-__all__ = ['RandomizedDFS', 'Wilson', 'FractalTessellation', 'Prim']
\ No newline at end of file
+__all__ = ['RandomizedDFS', 'Wilson', 'FractalTessellation', 'Prim', 'Kruskal', 'BinaryTree', 'Sidewinder', 'Eller', 'Tiled']
\ No newline at end of file
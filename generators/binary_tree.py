@@ -0,0 +1,56 @@
+from generators.IGenerator import IGenerator
+from maze.Maze import Maze, N, S, E, W, WALLS
+
+import numpy as np
+
+
+class BinaryTree(IGenerator):
+    vectorized = True
+
+    def generate(self, maze:Maze, rng=None) -> None:
+        """
+        Generate a maze with the Binary Tree algorithm.
+
+        Args:
+            maze; (Maze): The maze instance to update.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
+        """
+        maze.set_walls(self.generate_batch(1, maze.rows, maze.cols, rng)[0])
+
+    def generate_batch(self, n:int, rows:int, cols:int, rng=None) -> np.ndarray:
+        """
+        Generate a batch of mazes with the Binary Tree algorithm.
+
+        Works as follows:
+        1. For every cell, remove either its north or its west wall, with equal probability
+        2. Cells on the first row can only remove their west wall, cells in the first column only their north wall
+        3. The top-left cell removes no wall
+
+        Every cell makes its choice independently, so the whole batch is generated with a few array operations.
+
+        Args:
+            n; (int): The number of mazes to generate.
+            rows; (int): The number of rows of each maze.
+            cols; (int): The number of columns of each maze.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
+
+        Returns:
+            np.ndarray: The (n, rows, cols) uint8 wall bitmasks.
+        """
+        rng = np.random if rng is None else rng
+        walls = np.full((n, rows, cols), WALLS, dtype=np.uint8)
+
+        # Choose north or west for every cell
+        north = rng.random((n, rows, cols)) < 0.5
+        north[:, 0, :] = False
+        north[:, :, 0] = True
+        north[:, 0, 0] = False
+        west = ~north
+        west[:, 0, 0] = False
+
+        # Remove both sides of the chosen walls (every wall bit is removed at most once)
+        walls -= north * np.uint8(N)
+        walls[:, :-1, :] -= north[:, 1:, :] * np.uint8(S)
+        walls -= west * np.uint8(W)
+        walls[:, :, :-1] -= west[:, :, 1:] * np.uint8(E)
+        return walls
@@ -0,0 +1,163 @@
+from generators.IGenerator import IGenerator
+from maze.Maze import Maze, N, S, E, W, WALLS
+
+import numpy as np
+
+
+class Eller(IGenerator):
+    def merge_row(self, labels:list, walls:np.ndarray, draws:list, merge_all:bool) -> list:
+        """
+        Randomly join neighboring cells of a row that are in different sets (removing the wall between them).
+
+        The sets of the row are kept in a small union-find over the labels of the row.
+
+        Args:
+            labels; (list): The set label (in 0..cols-1) of every cell in the row.
+            walls; (np.ndarray): The (cols,) wall bits of the row. Updated in-place.
+            draws; (list): A uniform random number for every pair of neighboring cells.
+            merge_all; (bool): Join all neighboring cells in different sets (for the last row).
+
+        Returns:
+            list: The root label of every cell in the row after joining.
+        """
+        parents = list(range(len(labels)))
+
+        def find(label):
+            while parents[label] != label:
+                parents[label] = parents[parents[label]]
+                label = parents[label]
+            return label
+
+        carve_east = np.zeros(len(labels), dtype=bool)
+        for col in range(len(labels) - 1):
+            left, right = find(labels[col]), find(labels[col + 1])
+            if left != right and (merge_all or draws[col] < 0.5):
+                parents[right] = left
+                carve_east[col] = True
+
+        walls[:-1] -= carve_east[:-1] * np.uint8(E)
+        walls[1:] -= carve_east[:-1] * np.uint8(W)
+        return [find(label) for label in labels]
+
+    def iter_rows(self, rows:int, cols:int, rng=None):
+        """
+        Generate a maze with Eller's algorithm, one row at a time.
+
+        Works as follows, for every row:
+        1. Cells that are not connected to the row above get a new set
+        2. Randomly join neighboring cells that are in different sets (the last row joins all of them)
+        3. For every set, remove the south wall of at least one (random) cell, and of every other cell with probability 0.5
+        4. The cells below the removed south walls inherit the set, the others start a new set in the next row
+
+        Only the set labels of the current row are kept, so memory is proportional to the width of the maze.
+
+        Args:
+            rows; (int): The number of rows of the maze.
+            cols; (int): The number of columns of the maze.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
+
+        Yields:
+            np.ndarray: The (cols,) uint8 wall bits of every row, from top to bottom.
+        """
+        rng = np.random if rng is None else rng
+        # Cells connected to the row above, and their labels (in 0..cols-1)
+        carve_north = np.zeros(cols, dtype=bool)
+        labels = np.zeros(cols, dtype=np.intp)
+
+        for row in range(rows):
+            walls = np.full(cols, WALLS, dtype=np.uint8)
+            walls -= carve_north * np.uint8(N)
+
+            # 1. Give the cells that are not connected to the row above a new set
+            n_sets = labels[carve_north].max(initial=-1) + 1
+            labels[~carve_north] = n_sets + np.arange(cols - np.count_nonzero(carve_north))
+
+            # 2. Randomly join neighboring cells in different sets
+            last_row = row == rows - 1
+            roots = np.array(self.merge_row(labels.tolist(), walls, rng.random(cols).tolist(), last_row), dtype=np.intp)
+            if last_row:
+                yield walls
+                return
+
+            # 3. Remove south walls at random, and at least one in every set (in a random cell of the set)
+            carve_south = rng.random(cols) < 0.5
+            order = rng.permutation(cols)
+            set_labels, first = np.unique(roots[order], return_index=True)
+            has_south = np.zeros(cols, dtype=bool)
+            has_south[roots[carve_south]] = True
+            carve_south[order[first[~has_south[set_labels]]]] = True
+            walls -= carve_south * np.uint8(S)
+            yield walls
+
+            # 4. Keep the sets of the cells below the removed south walls, relabeled to 0..k-1
+            carve_north = carve_south
+            _, labels[carve_north] = np.unique(roots[carve_north], return_inverse=True)
+
+    def generate(self, maze:Maze, rng=None) -> None:
+        """
+        Generate a maze with Eller's algorithm.
+
+        Args:
+            maze; (Maze): The maze instance to update.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
+        """
+        walls = np.empty((maze.rows, maze.cols), dtype=np.uint8)
+        for row, row_walls in enumerate(self.iter_rows(maze.rows, maze.cols, rng)):
+            walls[row] = row_walls
+        maze.set_walls(walls)
+
+    def write_walls(self, filename:str, rows:int, cols:int, rng=None) -> np.memmap:
+        """
+        Stream a maze into a memory-mapped .npy file of (rows, cols) wall bits (see Maze.grid), row by row.
+
+        Args:
+            filename; (str): The .npy file to write.
+            rows; (int): The number of rows of the maze.
+            cols; (int): The number of columns of the maze.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
+
+        Returns:
+            np.memmap: The memory-mapped wall bits.
+        """
+        out = np.lib.format.open_memmap(filename, mode='w+', dtype=np.uint8, shape=(rows, cols))
+        for row, row_walls in enumerate(self.iter_rows(rows, cols, rng)):
+            out[row] = row_walls
+        out.flush()
+        return out
+
+    def write_npy(self, filename:str, rows:int, cols:int, holes:list=None, rng=None) -> np.memmap:
+        """
+        Stream a maze into a memory-mapped .npy file in the maze_to_npy pixel layout, row by row.
+
+        Args:
+            filename; (str): The .npy file to write.
+            rows; (int): The number of rows of the maze.
+            cols; (int): The number of columns of the maze.
+            holes; (list[tuple[int]]): The pixel indices of the holes in the outer walls. Defaults to the holes that
+                maze_to_npy makes for the default start (0, 0) and target (rows - 1, cols - 1) cells.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
+
+        Returns:
+            np.memmap: The memory-mapped (2*rows+1, 2*cols+1) uint8 pixels.
+        """
+        if holes is None:
+            # The rule of utils.create_dataset.get_hole: a cell in the first row gets its hole in the top wall,
+            # so the target cell of a single-row maze does too
+            holes = [(0, 1), (0, 2*cols-1) if rows == 1 else (2*rows, 2*cols-1)]
+        out = np.lib.format.open_memmap(filename, mode='w+', dtype=np.uint8, shape=(2*rows+1, 2*cols+1))
+        # Top border
+        out[0] = 1
+        cell_pixels = np.ones(2*cols+1, dtype=np.uint8)
+        south_pixels = np.ones(2*cols+1, dtype=np.uint8)
+        for row, row_walls in enumerate(self.iter_rows(rows, cols, rng)):
+            # Cells and the walls between them, then the south walls
+            cell_pixels[1::2] = 0
+            cell_pixels[2::2] = (row_walls & E) != 0
+            cell_pixels[0] = (row_walls[0] & W) != 0
+            south_pixels[1::2] = (row_walls & S) != 0
+            out[2*row+1] = cell_pixels
+            out[2*row+2] = south_pixels
+        for hole in holes:
+            out[hole] = 0
+        out.flush()
+        return out
@@ -1,59 +1,52 @@
 from generators.IGenerator import IGenerator
-from maze.Maze import Maze, Cell
+from maze.Maze import Maze, N, S, E, W, WALLS, VISITED, START, TARGET
 
-from collections import deque
 import numpy as np
-from copy import copy
 
 
 class FractalTessellation(IGenerator):
-    def __init__(self, n_tiles):
+    def __init__(self, n_tiles:int=None):
         """
         Initialize the FractalTessellation generator.
 
         Args:
-            n_tiles: int; The number of tiling steps to perform.
+            n_tiles: int; The number of tiling steps to perform. The generated maze is 2**n_tiles x 2**n_tiles.
+                Defaults to None, which infers the number of steps from the size of the maze.
         """
         self.n_tiles = n_tiles
 
-    def tile_wall_dict(self, wall_dict, current_size):
+    def get_n_tiles(self, maze: Maze) -> int:
         """
-        Tile the wall dictionary by copying the current wall dictionary to the next 3 quadrants.
+        Get the number of tiling steps for the given maze, and check that the maze has the matching size.
 
         Args:
-            wall_dict: list[list[dict]]; The wall dictionaries
-            current_size: int; The current size of the wall dictionary
+            maze; (Maze): The maze instance to generate.
+
+        Returns:
+            int: The number of tiling steps.
         """
-        for i in range(current_size):
-            for j in range(current_size):
-                # Copy over the current wall dictionary to the next 3 quadrants
-                current_wall_dict = wall_dict[i][j]
-                wall_dict[current_size+i][j] = copy(current_wall_dict)
-                wall_dict[i][current_size+j] = copy(current_wall_dict)
-                wall_dict[current_size+i][current_size+j] = copy(current_wall_dict)
+        n_tiles = self.n_tiles
+        if n_tiles is None:
+            n_tiles = max(maze.rows - 1, 0).bit_length()
+        if maze.rows != 2**n_tiles or maze.cols != 2**n_tiles:
+            raise ValueError(f'FractalTessellation with {n_tiles} tiling steps generates {2**n_tiles}x{2**n_tiles} mazes, '
+                             f'but the maze is {maze.rows}x{maze.cols}.')
+        return n_tiles
 
-    def wall_dict_to_np(self, wall_dict, current_size):
+    def tile_grid(self, grid, current_size):
         """
-        Convert the wall dictionary to a numpy array of Cell objects.
+        Tile the maze grid by copying the top-left quadrant to the next 3 quadrants.
 
         Args:
-            wall_dict: list[list[dict]]; The wall dictionaries
-            current_size: int; The current size of the wall dictionary
-        
-        Returns:
-            cells: np.array; The numpy array of Cell objects
+            grid: np.ndarray; The maze grid (see Maze.grid)
+            current_size: int; The current size of the top-left quadrant
         """
-        cells = np.empty((current_size, current_size), dtype=object)
-        for i in range(current_size):
-            for j in range(current_size):
-                cell = Cell(i,j)
-                cell.walls = wall_dict[i][j]
-                cells[i,j] = cell
-                cells[i,j].visited = True
-
-        return cells
+        quadrant = grid[:current_size, :current_size]
+        grid[current_size:2*current_size, :current_size] = quadrant
+        grid[:current_size, current_size:2*current_size] = quadrant
+        grid[current_size:2*current_size, current_size:2*current_size] = quadrant
         
-    def generate(self, maze: Maze) -> None:
+    def generate(self, maze: Maze, rng=None) -> None:
         """
         Generate a maze with the Fractal Tessellation algorithm.
 
@@ -63,32 +56,39 @@ class FractalTessellation(IGenerator):
         3. Break 3 walls between the tiled sections
         4. Repeat steps 2 and 3 for n_tiles iterations
 
+        Every step is one block copy of the wall bits in Maze.grid, so the maze is generated
+        in-place with O(n_tiles) numpy operations.
+
         Args:
-            maze; (Maze): The maze instance to update.
+            maze; (Maze): The maze instance to update. Must be 2**n_tiles x 2**n_tiles.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
         """
-        # Initialize the wall dictionary
-        wall_dict = [[{"N": True, "S": True, "E": True, "W": True} for _ in range(2**self.n_tiles)] for _ in range(2**self.n_tiles)]
+        rng = np.random if rng is None else rng
+        n_tiles = self.get_n_tiles(maze)
+        grid = maze.grid
+        # Start from a single visited cell with all walls
+        grid[0, 0] = WALLS | VISITED
         current_size = 1
-        # Define the side indices to offset and direction
+        # Define the side indices to offset, wall and opposite wall
         side_idx_to_offset_and_direction = {
-            0: ([0,1], "E", "W"),
-            1: ([0,1], "E", "W"),
-            2: ([1,0], "S", "N"),
-            3: ([1,0], "S", "N"),
+            0: ([0,1], E, W),
+            1: ([0,1], E, W),
+            2: ([1,0], S, N),
+            3: ([1,0], S, N),
         }
         # Perform n_tiles iterations of tiling
-        for _ in range(self.n_tiles):
+        for _ in range(n_tiles):
             # Randomly select the walls to break
-            random_idx = np.random.choice(np.arange(current_size), size=4)
+            random_idx = rng.choice(np.arange(current_size), size=4)
             side_offsets = np.array([
                 [random_idx[0], current_size-1],
                 [current_size + random_idx[1], current_size-1],
                 [current_size-1, random_idx[2]],
                 [current_size-1, current_size + random_idx[3]]
             ])
-            sides = np.random.choice(np.arange(0,4), size=3, replace=False)
-            # Tile the wall dictionary
-            self.tile_wall_dict(wall_dict, current_size)
+            sides = rng.choice(np.arange(0,4), size=3, replace=False)
+            # Tile the maze grid
+            self.tile_grid(grid, current_size)
             current_size *= 2
 
             # Remove 3 walls between the tiled sections
@@ -96,14 +96,11 @@ class FractalTessellation(IGenerator):
                 base_offset = side_offsets[side_idx]
                 next_offset, first_wall, second_wall = side_idx_to_offset_and_direction[side_idx]
                 i, j = base_offset
-                wall_dict[i][j][first_wall] = False
+                grid[i, j] &= ~np.uint8(first_wall)
                 
-                i, j = i +next_offset[0], j+next_offset[1]
-                wall_dict[i][j][second_wall] = False      
+                i, j = i + next_offset[0], j + next_offset[1]
+                grid[i, j] &= ~np.uint8(second_wall)
 
-        # Convert the wall dictionary to a numpy array of Cell objects
-        # And set the start and target indices
-        cells = self.wall_dict_to_np(wall_dict, current_size)
-        cells[maze.start_indices].is_start = True
-        cells[maze.target_indices].is_target = True
-        maze.cells = cells
+        # Set the start and target cells
+        grid[maze.start_indices] |= START
+        grid[maze.target_indices] |= TARGET
@@ -0,0 +1,83 @@
+from generators.IGenerator import IGenerator
+from maze.Maze import Maze, VISITED
+
+import numpy as np
+
+
+class Kruskal(IGenerator):
+    def find(self, parents:list, cell:int) -> int:
+        """
+        Find the root of the component of a cell, halving the path on the way.
+
+        Args:
+            parents; (list): The parent of every cell id in the union-find forest.
+            cell; (int): The cell id.
+
+        Returns:
+            int: The root cell id of the component.
+        """
+        while parents[cell] != cell:
+            parents[cell] = parents[parents[cell]]
+            cell = parents[cell]
+        return cell
+
+    def generate(self, maze:Maze, rng=None) -> None:
+        """
+        Generate a maze with the Randomized Kruskal's algorithm.
+
+        Works as follows:
+        1. Put every cell in its own component
+        2. Shuffle all interior walls (edges between neighboring cells) once
+        3. For every wall in order, remove it if the cells on both sides are in different components,
+            and merge the components
+        4. Stop when all cells are in one component
+
+        The components are kept in an array-based union-find with path compression and union by rank.
+
+        Args:
+            maze; (Maze): The maze instance to update.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
+        """
+        rng = np.random if rng is None else rng
+        rows, cols = maze.rows, maze.cols
+        n_cells = rows * cols
+
+        # Interior edges: the east wall of every cell but the last column, and the south wall of every cell but the last row
+        cell_ids = np.arange(n_cells).reshape(rows, cols)
+        east_cells = cell_ids[:, :-1].ravel()
+        south_cells = cell_ids[:-1, :].ravel()
+        first_cells = np.concatenate([east_cells, south_cells])
+        second_cells = np.concatenate([east_cells + 1, south_cells + cols])
+
+        # Shuffle every edge once
+        order = rng.permutation(len(first_cells))
+        first_list = first_cells[order].tolist()
+        second_list = second_cells[order].tolist()
+
+        parents = list(range(n_cells))
+        ranks = [0] * n_cells
+        removed = np.zeros(len(first_cells), dtype=bool)
+        n_components = n_cells
+
+        for k in range(len(order)):
+            if n_components == 1:
+                break
+            first_root = self.find(parents, first_list[k])
+            second_root = self.find(parents, second_list[k])
+            if first_root == second_root:
+                continue
+            # Union by rank
+            if ranks[first_root] < ranks[second_root]:
+                first_root, second_root = second_root, first_root
+            parents[second_root] = first_root
+            if ranks[first_root] == ranks[second_root]:
+                ranks[first_root] += 1
+            removed[k] = True
+            n_components -= 1
+
+        # Remove the walls of the merged edges
+        removed_edges = order[removed]
+        n_east = len(east_cells)
+        maze.remove_walls(east_cells[removed_edges[removed_edges < n_east]], 'E')
+        maze.remove_walls(south_cells[removed_edges[removed_edges >= n_east] - n_east], 'S')
+        maze.grid |= VISITED
@@ -1,44 +1,80 @@
 from generators.IGenerator import IGenerator
-from maze.Maze import Maze, Cell
+from maze.Maze import Maze
 
-from collections import deque
 import numpy as np
-from itertools import product
 
 
-class Prim(IGenerator):
-    def frontier_insert(self, frontier, maze:Maze, vertex_indices, visited_indices):
+class Frontier:
+    """
+    Set of integer cell ids with O(1) insert, remove and random pick.
+    The ids are kept in a list, and a position array maps each id to its index in the list (-1 if absent).
+    """
+    __slots__ = ('items', 'positions')
+
+    def __init__(self, n_cells:int) -> None:
+        """
+        Initialize an empty frontier for cell ids 0..n_cells-1.
+
+        Args:
+            n_cells; (int): The number of cells in the maze.
+        """
+        self.items = []
+        self.positions = [-1] * n_cells
+
+    def insert(self, cell:int) -> None:
+        """
+        Insert a cell id, if it is not in the frontier yet.
+
+        Args:
+            cell; (int): The cell id to insert.
+        """
+        if self.positions[cell] < 0:
+            self.positions[cell] = len(self.items)
+            self.items.append(cell)
+
+    def remove(self, cell:int) -> None:
         """
-        Given most-recent position (vertex_indices), add all (unvisited) neighbors to the frontier.
+        Remove a cell id, by moving the last id into its position.
 
         Args:
-            frontier: (dict) Dictionary of frontier cells
-            maze: (Maze) The maze object
-            vertex_indices: (tuple) The current vertex indices
-            visited_indices: (set) The set of visited indices
+            cell; (int): The cell id to remove.
+        """
+        position = self.positions[cell]
+        last_cell = self.items.pop()
+        if last_cell != cell:
+            self.items[position] = last_cell
+            self.positions[last_cell] = position
+        self.positions[cell] = -1
+
+    def pop_random(self, draw:float) -> int:
+        """
+        Remove and return a uniformly random cell id.
+
+        Args:
+            draw; (float): A uniform random number in [0, 1).
 
         Returns:
-            frontier: (dict) Updated frontier dictionary
+            int: The removed cell id.
+        """
+        cell = self.items[int(draw * len(self.items))]
+        self.remove(cell)
+        return cell
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class Prim(IGenerator):
+    def __init__(self, block_size:int=4096):
         """
-        vertex = maze.get_cell(*vertex_indices)
-        vertex.visit()
-        possible_directions = maze.get_unvisited_neighbors_directions(vertex)
-        for possible_direction in possible_directions:
-            neighbor = maze.get_next_cell(vertex, possible_direction)
-            # insert into frontier
-            i, j = neighbor.row, neighbor.col
-            # Check if we have already visited this neighbor
-            # If so, skip this iteration
-            if (i,j) in visited_indices:
-                continue
-            # Insert the neighbor into the frontier dictionary
-            if frontier.get((i,j)) is not None:
-                frontier[(i,j)].append((vertex_indices, possible_direction))
-            else:
-                frontier[(i,j)] = [(vertex_indices, possible_direction)]
-        return frontier
-
-    def generate(self, maze: Maze) -> None:
+        Initialize the Prim generator.
+
+        Args:
+            block_size; (int): The number of random numbers to draw at once.
+        """
+        self.block_size = block_size
+
+    def generate(self, maze: Maze, rng=None) -> None:
         """
         Generate a maze with the Randomized Prim's algorithm.
 
@@ -49,41 +85,53 @@ class Prim(IGenerator):
             ie edges that connect vi in V to vj not in V
         3. Add that edge to the MST and add vj to V
         4. Repeat steps 2 and 3 until all vertices are visited
+
+        Step 2 picks a uniformly random frontier cell vj, and then a uniformly random
+        neighbor vi of vj in V. Cells are integer ids row*cols+col, V is a single visited bitmap.
+
+        Args:
+            maze; (Maze): The maze instance to update.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
         """
-        # Define inverse directions lookup table
-        inverse_directions = {
-            "N":"S",
-            "E":"W",
-            "S":"N",
-            "W":"E"
-        }
-        # Create a set of unvisited vertex indices
-        unvisited_vertex_indices = set()
-        for i, j in product(np.arange(maze.rows), np.arange(maze.cols)):
-            unvisited_vertex_indices.add((i,j))
-        # Create a set of visited vertex indices
-        visited_vertex_indices = set()
-        start_vertex_indices = unvisited_vertex_indices.pop()
-        visited_vertex_indices.add(start_vertex_indices)
-
-        frontier = self.frontier_insert(dict(), maze, start_vertex_indices, visited_vertex_indices)
-        
-        while unvisited_vertex_indices:
-            # Pick a random cell on the frontier of the current MST
-            keys_list = list(frontier.keys())
-            random_idx = np.random.randint(0, len(keys_list))
-            frontier_neighbor_idx = keys_list[random_idx]
-            reachable_from = frontier.pop(frontier_neighbor_idx)
-            seen_cell_tuple = reachable_from[np.random.randint(0, len(reachable_from))]
-            # Remove wall between seen cell and frontier cell
-            seen_cell = maze.get_cell(*seen_cell_tuple[0])
-            seen_cell.remove_wall(seen_cell_tuple[1])
-            # Remove wall (inverse direction) from frontier cell
-            new_cell = maze.get_cell(*frontier_neighbor_idx)
-            new_cell.remove_wall(inverse_directions[seen_cell_tuple[1]])
-            
-            # Add all neighbors of the new cell to the frontier dictionary
-            frontier = self.frontier_insert(frontier, maze, frontier_neighbor_idx, visited_vertex_indices)
-            # Remove from unvisited index set and add to visited index set
-            visited_vertex_indices.add(frontier_neighbor_idx)
-            unvisited_vertex_indices.remove(frontier_neighbor_idx)
+        rng = np.random if rng is None else rng
+        n_cells = maze.rows * maze.cols
+        offsets = maze.get_direction_offsets()
+
+        # In-bounds neighbor mask per cell id (bit k set for direction code k)
+        legal = maze.get_legal_masks()
+
+        visited = bytearray(n_cells)
+        frontier = Frontier(n_cells)
+        # Direction from each cell to the cell it was connected to (-1 for the first cell)
+        parent_direction = np.full(n_cells, -1, dtype=np.int8)
+
+        # Random numbers are drawn in blocks
+        block = rng.random(self.block_size).tolist()
+        block_idx = 0
+
+        # 1. Choose a random node v
+        new_cell = int(block[0] * n_cells)
+        block_idx = 1
+        for _ in range(n_cells):
+            visited[new_cell] = 1
+            new_legal = legal[new_cell]
+            for direction in range(4):
+                if new_legal & (1 << direction) and not visited[new_cell + offsets[direction]]:
+                    frontier.insert(new_cell + offsets[direction])
+
+            if not frontier:
+                break
+
+            if block_idx + 2 > len(block):
+                block = rng.random(self.block_size).tolist()
+                block_idx = 0
+            # 2. Pick a random cell on the frontier, and a random visited neighbor of it
+            new_cell = frontier.pop_random(block[block_idx])
+            new_legal = legal[new_cell]
+            seen_directions = [direction for direction in range(4)
+                               if new_legal & (1 << direction) and visited[new_cell + offsets[direction]]]
+            parent_direction[new_cell] = seen_directions[int(block[block_idx + 1] * len(seen_directions))]
+            block_idx += 2
+
+        # 3. Remove the walls between every cell and the cell it was connected to
+        maze.carve_from_parents(parent_direction)
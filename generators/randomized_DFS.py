@@ -1,72 +1,120 @@
 from generators.IGenerator import IGenerator
-from maze.Maze import Maze, Cell
+from maze.Maze import Maze
 
-from collections import deque
 import numpy as np
 
 
 class RandomizedDFS(IGenerator):
-    def __init__(self, bias:float=0.5):
+    def __init__(self, bias:float=0.5, block_size:int=4096):
         """
         Remove walls in the given Maze, using the Randomized Depth-First-Search algorithm.
 
         Args:
-            maze; (Maze): Maze instance, with unconnected, unvisited cells.
             bias; (float): Bias for the direction of the DFS. Closer to 0.0 for horizontal, to 1.0 for vertical.
+            block_size; (int): The number of random numbers to draw at once.
         """
         self.bias = bias
+        self.block_size = block_size
+        self.cumulative_probabilities = self.get_cumulative_probabilities(bias)
+
+    def get_cumulative_probabilities(self, bias:float) -> list:
+        """
+        Precompute the direction probabilities for every combination of unvisited neighbors.
+
+        Direction codes 0..3 are N, S, E, W (the order of DIRECTION_BITS). N and S get weight 1-bias,
+        E and W get weight bias, and if all unvisited neighbors have weight 0 they are chosen uniformly.
+
+        Args:
+            bias; (float): Bias for the direction of the DFS.
+
+        Returns:
+            list: For each 4-bit mask of unvisited neighbors, a list of (direction code, cumulative probability)
+                (empty for mask 0).
+        """
+        weights = [1 - bias, 1 - bias, bias, bias]
+        table = []
+        for mask in range(16):
+            directions = [direction for direction in range(4) if mask & (1 << direction)]
+            if not directions:
+                # No unvisited neighbors, nothing to choose from
+                table.append([])
+                continue
+            mask_weights = [weights[direction] for direction in directions]
+            if sum(mask_weights) == 0:
+                # If all the probabilities are 0, set them to 1
+                mask_weights = [1 for _ in mask_weights]
+            cumulative = np.cumsum(mask_weights) / sum(mask_weights)
+            # Guard against rounding: the last direction catches every draw
+            table.append([(direction, threshold if k < len(directions) - 1 else np.inf)
+                          for k, (direction, threshold) in enumerate(zip(directions, cumulative.tolist()))])
+        return table
 
-    def generate(self, maze:Maze) -> None:
+    def generate(self, maze:Maze, rng=None) -> None:
         """
         Remove walls in the given Maze, using the Randomized Depth-First-Search algorithm.
 
         Args:
             maze; (Maze): Maze instance, with unconnected, unvisited cells.
-            bias; (float): Bias for the direction of the DFS. Closer to 0.0 for horizontal, to 1.0 for vertical.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
         """
+        rng = np.random if rng is None else rng
+        cols = maze.cols
+        n_cells = maze.rows * cols
+        offsets = maze.get_direction_offsets()
+
+        # In-bounds neighbor mask per cell id (bit k set for direction code k)
+        legal = maze.get_legal_masks()
+
+        visited = bytearray(n_cells)
+        # Direction from each cell to the cell it was carved from (-1 for the start cell)
+        parent_direction = np.full(n_cells, -1, dtype=np.int8)
+        opposite = [1, 0, 3, 2]
+        table = self.cumulative_probabilities
+
+        # Random numbers are drawn in blocks
+        block = []
+        block_idx = 0
+
         # Start the generation from the starting square
-        current_cell = maze.get_cell(*maze.start_indices)
-        current_cell.visit()
-        # Initialize a stack
-        stack = deque([current_cell])
+        start_cell = maze.start_indices[0] * cols + maze.start_indices[1]
+        visited[start_cell] = 1
+        # Initialize a stack of cell ids
+        stack = np.empty(n_cells, dtype=np.int64)
+        stack[0] = start_cell
+        top = 1
         # Algorithm outline:
         # While the stack is not empty
-        # 1. Pop the last cell C added to the stack (LIFO)
-        # 2. If C has any unvisited neighbors, add C back to the stack.
-        # 3. Next, choose an unvisited neighbor N uniformly at random, and add N to the stack
+        # 1. Look at the last cell C added to the stack (LIFO)
+        # 2. If C has no unvisited neighbors, pop it from the stack.
+        # 3. Otherwise, choose an unvisited neighbor N at random (with the biased probabilities), and add N to the stack
         # 4. Finally, remove the wall in between the C and N
+        while top:
+            # 1. Look at the last cell C added to the stack (LIFO)
+            current_cell = int(stack[top - 1])
+            # 2. If C has no unvisited neighbors, pop it from the stack.
+            unvisited = 0
+            current_legal = legal[current_cell]
+            for direction in range(4):
+                if current_legal & (1 << direction) and not visited[current_cell + offsets[direction]]:
+                    unvisited |= 1 << direction
+            if not unvisited:
+                top -= 1
+                continue
+
+            # 3. Next, choose an unvisited neighbor N at random, and add N to the stack
+            if block_idx == len(block):
+                block = rng.random(self.block_size).tolist()
+                block_idx = 0
+            draw = block[block_idx]
+            block_idx += 1
+            for next_direction, threshold in table[unvisited]:
+                if draw < threshold:
+                    break
+            next_cell = current_cell + offsets[next_direction]
+            visited[next_cell] = 1
+            stack[top] = next_cell
+            top += 1
+            # 4. Finally, remember the wall in between the C and N
+            parent_direction[next_cell] = opposite[next_direction]
 
-        horizontal_probs = self.bias
-        vertical_probs = 1-self.bias
-
-        probability_lookup = {
-            "N": vertical_probs,
-            "S": vertical_probs,
-            "E": horizontal_probs,
-            "W": horizontal_probs
-        }
-        
-        while stack:
-            # 1. Pop the last cell C added to the stack (LIFO)
-            current_cell:Cell = stack.pop()
-            # 2. If C has any unvisited neighbors, add C back to the stack.
-            unvisited_neighbors_directions = maze.get_unvisited_neighbors_directions(current_cell)
-            if len(unvisited_neighbors_directions) > 0:
-                # Compute the probabilities for each direction
-                probabilities = [probability_lookup[direction] for direction in unvisited_neighbors_directions]
-                
-                if sum(probabilities) == 0:
-                    # If all the probabilities are 0, set them to 1
-                    probabilities = [1 for _ in probabilities]
-                    
-                # normalize probabilities
-                probabilities = [p/sum(probabilities) for p in probabilities]
-                stack.append(current_cell)
-                # 3. Next, choose an unvisited neighbor N uniformly at random, and add N to the stack
-                next_direction:str = np.random.choice(unvisited_neighbors_directions, p=probabilities)
-                next_cell:Cell = maze.get_next_cell(current_cell, next_direction)
-                next_cell.visit()
-                stack.append(next_cell)
-                # Finally, remove the wall in between the C and N
-                current_cell.remove_wall(next_direction)
-                next_cell.remove_wall(maze.get_opposite_direction(next_direction))
\ No newline at end of file
+        maze.carve_from_parents(parent_direction)
@@ -0,0 +1,69 @@
+from generators.IGenerator import IGenerator
+from maze.Maze import Maze, N, S, E, W, WALLS
+
+import numpy as np
+
+
+class Sidewinder(IGenerator):
+    vectorized = True
+
+    def generate(self, maze:Maze, rng=None) -> None:
+        """
+        Generate a maze with the Sidewinder algorithm.
+
+        Args:
+            maze; (Maze): The maze instance to update.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
+        """
+        maze.set_walls(self.generate_batch(1, maze.rows, maze.cols, rng)[0])
+
+    def generate_batch(self, n:int, rows:int, cols:int, rng=None) -> np.ndarray:
+        """
+        Generate a batch of mazes with the Sidewinder algorithm.
+
+        Works as follows:
+        1. The first row is one open corridor
+        2. Every other row is split into runs of cells: after every cell, the run is closed with probability 0.5
+            (and always at the last column). Within a run, the east walls are removed
+        3. Every closed run removes the north wall of one of its cells, chosen uniformly
+
+        The runs of a row only depend on that row, so all rows of all mazes in the batch are handled at once:
+        the start of the run of every cell is found with a running maximum over the closing positions.
+
+        Args:
+            n; (int): The number of mazes to generate.
+            rows; (int): The number of rows of each maze.
+            cols; (int): The number of columns of each maze.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
+
+        Returns:
+            np.ndarray: The (n, rows, cols) uint8 wall bitmasks.
+        """
+        rng = np.random if rng is None else rng
+        walls = np.full((n, rows, cols), WALLS, dtype=np.uint8)
+
+        # 1. The first row is one open corridor
+        walls[:, 0, :-1] &= ~np.uint8(E)
+        walls[:, 0, 1:] &= ~np.uint8(W)
+
+        # 2. Close the runs of the other rows at random, and always at the last column
+        close = rng.random((n, rows - 1, cols)) < 0.5
+        close[:, :, -1] = True
+        carve_east = ~close[:, :, :-1]
+        walls[:, 1:, :-1] -= carve_east * np.uint8(E)
+        walls[:, 1:, 1:] -= carve_east * np.uint8(W)
+
+        # 3. Every run starts right after the previous closing position
+        col_idx = np.arange(cols)
+        last_close = np.maximum.accumulate(np.where(close, col_idx, -1), axis=-1)
+        run_start = np.empty_like(last_close)
+        run_start[..., 0] = 0
+        run_start[..., 1:] = last_close[..., :-1] + 1
+
+        # Remove the north wall of a uniformly chosen cell of every closed run
+        batch_idx, row_idx, end_col = np.nonzero(close)
+        start_col = run_start[batch_idx, row_idx, end_col]
+        north_col = start_col + (rng.random(len(end_col)) * (end_col - start_col + 1)).astype(np.intp)
+        walls[batch_idx, row_idx + 1, north_col] &= ~np.uint8(N)
+        walls[batch_idx, row_idx, north_col] &= ~np.uint8(S)
+        return walls
@@ -0,0 +1,86 @@
+from generators.IGenerator import IGenerator
+from generators.kruskal import Kruskal
+from maze.Maze import Maze, WALLS
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+import numpy as np
+
+
+def generate_tile(generator:IGenerator, rows:int, cols:int, seed:int) -> np.ndarray:
+    """
+    Generate a single tile (in a worker process).
+
+    Args:
+        generator; (IGenerator): The generator to use for the tile.
+        rows; (int): The number of rows of the tile.
+        cols; (int): The number of columns of the tile.
+        seed; (int): The seed for the random number generator of the tile.
+
+    Returns:
+        np.ndarray: The (rows, cols) uint8 wall bits of the tile.
+    """
+    return Maze(rows, cols, generator=generator, rng=np.random.default_rng(seed)).grid & WALLS
+
+
+class Tiled(IGenerator):
+    def __init__(self, generator:IGenerator, tile_size:int=256, processes:int=None):
+        """
+        Initialize the Tiled generator.
+
+        Args:
+            generator; (IGenerator): The generator to use for every tile.
+            tile_size; (int): The number of rows and columns of a tile (the tiles on the bottom/right edges may be smaller).
+            processes; (int): The number of worker processes. Defaults to the number of CPUs. With 1, the tiles are generated in-process.
+        """
+        self.generator = generator
+        self.tile_size = tile_size
+        self.processes = processes
+
+    def generate(self, maze:Maze, rng=None) -> None:
+        """
+        Generate a large maze by generating its tiles independently, in parallel worker processes.
+
+        Works as follows:
+        1. Split the maze into tiles of tile_size x tile_size cells
+        2. Generate every tile with the tile generator, in a worker process
+        3. Generate a random spanning tree over the grid of tiles
+        4. For every edge of that tree, remove one random wall on the border between the two tiles
+
+        Every tile is a perfect maze, and the tiles are joined along a spanning tree, so the result
+        is a single connected perfect maze (like the quadrants of FractalTessellation).
+
+        Args:
+            maze; (Maze): The maze instance to update.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
+        """
+        rng = np.random if rng is None else rng
+        rows, cols, tile_size = maze.rows, maze.cols, self.tile_size
+        row_starts = list(range(0, rows, tile_size))
+        col_starts = list(range(0, cols, tile_size))
+        tiles = [(row_start, col_start, min(tile_size, rows - row_start), min(tile_size, cols - col_start))
+                 for row_start in row_starts for col_start in col_starts]
+        seeds = (rng.random(len(tiles)) * 2**32).astype(np.uint64).tolist()
+
+        # 1-2. Generate the tiles
+        tile_args = ([self.generator] * len(tiles), [tile[2] for tile in tiles], [tile[3] for tile in tiles], seeds)
+        walls = np.empty((rows, cols), dtype=np.uint8)
+        with (ProcessPoolExecutor(self.processes) if self.processes != 1 else nullcontext()) as pool:
+            tile_walls = map(generate_tile, *tile_args) if pool is None else pool.map(generate_tile, *tile_args)
+            for (row_start, col_start, tile_rows, tile_cols), tile in zip(tiles, tile_walls):
+                walls[row_start:row_start + tile_rows, col_start:col_start + tile_cols] = tile
+        maze.set_walls(walls)
+
+        # 3. Random spanning tree over the grid of tiles
+        tile_maze = Maze(len(row_starts), len(col_starts), generator=Kruskal(), rng=rng)
+
+        # 4. Join neighboring tiles along the edges of the spanning tree
+        for tile_row, row_start in enumerate(row_starts):
+            for tile_col, col_start in enumerate(col_starts):
+                tile_cell = tile_maze.get_cell(tile_row, tile_col)
+                tile_rows = min(tile_size, rows - row_start)
+                tile_cols = min(tile_size, cols - col_start)
+                if not tile_cell.walls['E']:
+                    maze.remove_wall(row_start + int(rng.random() * tile_rows), col_start + tile_cols - 1, 'E')
+                if not tile_cell.walls['S']:
+                    maze.remove_wall(row_start + tile_rows - 1, col_start + int(rng.random() * tile_cols), 'S')
@@ -1,55 +1,19 @@
 from generators.IGenerator import IGenerator
-from maze.Maze import Maze, Cell
-from collections import deque
+from maze.Maze import Maze, MASK_DIRECTIONS
 import numpy as np
 
-class ListDict(object):
-    """
-    Adapted from Amber's reply to:
-    https://stackoverflow.com/questions/15993447/python-data-structure-for-efficient-add-remove-and-random-choice
-    """
-    def __init__(self):
-        """
-        Initialize a ListDict object.
-        """
-        self._list = []
-        self._dict = {}
-    
-    def append(self, item):
-        """
-        Append an item to the list and add it to the dictionary.
 
-        Args:
-            item; (object): The item to append.
-        """
-        if item not in self._dict:
-            self._list.append(item)
-            self._dict[item] = len(self._list) - 1
-        
-    def remove(self, item):
+class Wilson(IGenerator):
+    def __init__(self, block_size:int=4096):
         """
-        Remove an item from the list and dictionary.
+        Initialize the Wilson generator.
 
         Args:
-            item; (object): The item to remove.
+            block_size; (int): The number of random numbers to draw at once for the random walks.
         """
-        position = self._dict.pop(item)
-        last_item = self._list.pop()
-        if position != len(self._list):
-            self._list[position] = last_item
-            self._dict[last_item] = position
-
-    def get_random_item(self):
-        return np.random.choice(self._list)
-
-    def __len__(self):
-        return len(self._list)
-    
-    def __contains__(self, item):
-        return item in self._dict
+        self.block_size = block_size
 
-class Wilson(IGenerator):
-    def generate(self, maze:Maze) -> None:
+    def generate(self, maze:Maze, rng=None) -> None:
         """
         Use Wilson's algorithm to generate a maze.
 
@@ -61,86 +25,57 @@ class Wilson(IGenerator):
         * Note: If the path intersects itself, remove the loop and add the path to the UST.
         4. Repeat steps 2 and 3 until all cells are in the UST.
 
+        Cells are addressed by their id row*cols+col, and the walk only stores the last direction
+        taken out of each cell (which erases loops implicitly). The cells are picked in the order of a
+        random permutation, skipping the ones already in the UST, which does not change the
+        (uniform) distribution of the spanning trees.
+
         Args:
             maze; (Maze): The maze instance to update.
+            rng; (np.random.Generator): The random number generator. Defaults to the global np.random state.
         """
-        rows = maze.rows
-        cols = maze.cols
-        
-        # Initialize a 2D array to store the legal directions for each cell
-        legal_directions = np.full((rows, cols), fill_value=15, dtype=int)
-        idx_to_directions = {1: ['N'], 2: ['S'], 4: ['E'], 8: ['W'],
-         3: ['N', 'S'], 5: ['N', 'E'], 9: ['N', 'W'],
-         6: ['S', 'E'], 10: ['S', 'W'], 12: ['E', 'W'],
-         7: ['N', 'S', 'E'], 11: ['N', 'S', 'W'],
-         13: ['N', 'E', 'W'], 14: ['S', 'E', 'W'],
-         15: ['N', 'S', 'E', 'W']
-        }
+        rng = np.random if rng is None else rng
+        n_cells = maze.rows * maze.cols
+        offsets = maze.get_direction_offsets()
 
-        # Remove the directions that are out of bounds
-        legal_directions[0,:] -= 1
-        legal_directions[-1,:] -= 2
-        legal_directions[:,0] -= 8
-        legal_directions[:,-1] -= 4
-        
-        # Initialize a list to store the unvisited cells
-        unvisited_cells = ListDict()
-        for i, j in np.ndindex(rows, cols):
-            unvisited_cells.append(maze.get_cell(i, j))
-        
-        # Choose a random cell to start the generation
-        current_cell:Cell = unvisited_cells.get_random_item()
-        current_cell.visit()
-        unvisited_cells.remove(current_cell)
+        # In-bounds neighbor mask per cell id (bit k set for direction code k)
+        legal = maze.get_legal_masks()
 
-        # Initialize a list to store the visited cells
-        visited_cells = set()
-        visited_cells.add(current_cell)
+        # Walk state: last direction out of each cell, and UST membership
+        next_direction = np.zeros(n_cells, dtype=np.int8)
+        in_tree = bytearray(n_cells)
+        # Direction from each cell to its parent in the UST (-1 for the root)
+        parent_direction = np.full(n_cells, -1, dtype=np.int8)
 
-        # Initialize path array
-        path = np.zeros((rows, cols), dtype=object)
+        # Random numbers are drawn in blocks
+        block = []
+        block_idx = 0
 
-        while len(unvisited_cells) > 0:
-            # Choose a random unvisited cell
-            first_cell:Cell = unvisited_cells.get_random_item()
-            current_cell:Cell = first_cell
-            # While the current cell is not visited, do a random walk
-            while True:
-                # Get the current cell's row and column
-                current_row, current_col = current_cell.row, current_cell.col
-                # Get the legal directions for the current cell
-                current_legal_directions = legal_directions[current_row, current_col]
-                # Choose a random (legal) direction to move
-                next_direction = np.random.choice(idx_to_directions[current_legal_directions])
-                # Update the path array
-                path[current_row, current_col] = next_direction
-                # Move to the next cell
-                current_cell = maze.get_next_cell(current_cell, next_direction)
-                # If the next cell is visited, break the loop
-                if current_cell in visited_cells:
-                    break
+        order = rng.permutation(n_cells).tolist()
+        # Choose a random cell to start the generation
+        in_tree[order[0]] = 1
 
-            # Reconstruct the path from the first cell to the current cell, visiting each cell along the way
+        for first_cell in order:
+            if in_tree[first_cell]:
+                continue
+            # Random walk until a cell in the UST is encountered
             current_cell = first_cell
-            
-            while True:
-                # Add the current cell to the visited set
-                visited_cells.add(current_cell)
-                current_cell.visit()
-                # Remove the current cell from the unvisited SetDict
-                unvisited_cells.remove(current_cell)
-                # Get the direction to the next cell
-                direction = path[current_cell.row, current_cell.col]
-                # Get the opposite direction
-                opposite_direction = maze.get_opposite_direction(direction)
-                # Get the next cell
-                next_cell = maze.get_next_cell(current_cell, direction)
-                # Remove the wall between the current cell and the next cell
-                current_cell.remove_wall(direction)
-                # Remove the wall between the next cell and the current cell
-                next_cell.remove_wall(opposite_direction)
-                # Move to the next cell
-                current_cell = next_cell
-                # If the next cell is visited, break the loop
-                if current_cell in visited_cells:
-                    break
+            while not in_tree[current_cell]:
+                if block_idx == len(block):
+                    block = rng.random(self.block_size).tolist()
+                    block_idx = 0
+                directions = MASK_DIRECTIONS[legal[current_cell]]
+                direction = directions[int(block[block_idx] * len(directions))]
+                block_idx += 1
+                next_direction[current_cell] = direction
+                current_cell += offsets[direction]
+
+            # Add the loop-erased path from the first cell to the UST
+            current_cell = first_cell
+            while not in_tree[current_cell]:
+                in_tree[current_cell] = 1
+                direction = next_direction[current_cell]
+                parent_direction[current_cell] = direction
+                current_cell += offsets[direction]
+
+        maze.carve_from_parents(parent_direction)
@@ -1,29 +1,126 @@
 import numpy as np
+from collections.abc import Mapping
+
+# Bit layout of a cell in the maze grid (one uint8 per cell)
+N, S, E, W = 1, 2, 4, 8
+WALLS    = N | S | E | W
+VISITED  = 16
+START    = 32
+TARGET   = 64
+
+DIRECTION_BITS = {'N': N, 'S': S, 'E': E, 'W': W}
+OPPOSITE_BITS  = {'N': S, 'S': N, 'E': W, 'W': E}
+# Direction codes 0..3 (N, S, E, W) set in each 4-bit mask of directions, in that order
+MASK_DIRECTIONS = [[direction for direction in range(4) if mask & (1 << direction)] for mask in range(16)]
+
+
+class Walls(Mapping):
+    """
+    Dict-like view on the wall bits of a single cell, ordered 'N', 'S', 'E', 'W'.
+    Reading and writing a key reads and writes the underlying maze grid.
+    """
+    __slots__ = ('_cell',)
+
+    def __init__(self, cell) -> None:
+        self._cell = cell
+
+    def __getitem__(self, direction:str) -> bool:
+        return bool(self._cell._grid[self._cell._idx] & DIRECTION_BITS[direction])
+
+    def __setitem__(self, direction:str, value:bool) -> None:
+        cell = self._cell
+        if value:
+            cell._grid[cell._idx] |= DIRECTION_BITS[direction]
+        else:
+            cell._grid[cell._idx] &= ~DIRECTION_BITS[direction] & 0xFF
+
+    def __iter__(self):
+        return iter(DIRECTION_BITS)
+
+    def __len__(self) -> int:
+        return 4
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
 
 class Cell:
-    def __init__(self, row:int, col:int, is_start:bool=False, is_target:bool=False) -> None:
+    __slots__ = ('row', 'col', '_grid', '_idx')
+
+    def __init__(self, row:int, col:int, is_start:bool=False, is_target:bool=False, grid:np.ndarray=None) -> None:
         """
         Initialize a cell with its row and column indices.
         Set all walls to True and visited to False.
 
+        If a grid is given, the cell is a lightweight view on grid[row, col] and all its state
+        (walls, visited, start, target) is read from and written to that grid.
+        Otherwise the cell owns its own (single-element) storage.
+
         Args:
             row; (int): The row index of the cell.
             col; (int): The column index of the cell.
             is_start; (bool): True if the cell is the start cell, False otherwise.
             is_target; (bool): True if the cell is the target cell, False otherwise.
+            grid; (np.ndarray): The uint8 maze grid that the cell views. Defaults to None.
         """
         self.row        :int  = row
         self.col        :int  = col
-        self.walls      :dict = {'N': True, 'S': True, 'E': True, 'W': True}
-        self.visited    :bool = False
-        self.is_start   :bool = is_start
-        self.is_target  :bool = is_target
+        if grid is None:
+            self._grid  = np.array([WALLS], dtype=np.uint8)
+            self._idx   = 0
+            self.is_start  = is_start
+            self.is_target = is_target
+        else:
+            self._grid  = grid
+            self._idx   = (row, col)
+
+    def _get_flag(self, flag:int) -> bool:
+        return bool(self._grid[self._idx] & flag)
+
+    def _set_flag(self, flag:int, value:bool) -> None:
+        if value:
+            self._grid[self._idx] |= flag
+        else:
+            self._grid[self._idx] &= ~flag & 0xFF
+
+    @property
+    def walls(self) -> Walls:
+        return Walls(self)
+
+    @walls.setter
+    def walls(self, walls:dict) -> None:
+        for direction, value in walls.items():
+            self._set_flag(DIRECTION_BITS[direction], value)
+
+    @property
+    def visited(self) -> bool:
+        return self._get_flag(VISITED)
+
+    @visited.setter
+    def visited(self, value:bool) -> None:
+        self._set_flag(VISITED, value)
+
+    @property
+    def is_start(self) -> bool:
+        return self._get_flag(START)
+
+    @is_start.setter
+    def is_start(self, value:bool) -> None:
+        self._set_flag(START, value)
+
+    @property
+    def is_target(self) -> bool:
+        return self._get_flag(TARGET)
+
+    @is_target.setter
+    def is_target(self, value:bool) -> None:
+        self._set_flag(TARGET, value)
 
     def visit(self) -> None:
         """
         Set the cell as visited.
         """
-        self.visited = True
+        self._grid[self._idx] |= VISITED
 
     def remove_wall(self, direction) -> None:
         """
@@ -33,7 +130,7 @@ class Cell:
         Args:
             direction; (str): The direction of the wall to remove.
         """
-        self.walls[direction] = False
+        self._grid[self._idx] &= ~DIRECTION_BITS[direction] & 0xFF
 
     def get_possible_neighbors(self) -> list:
         """
@@ -43,7 +140,8 @@ class Cell:
         Returns:
             list: A list of possible neighbors of the cell.
         """
-        return [key for key, value in self.walls.items() if not value]
+        bits = self._grid[self._idx]
+        return [key for key, bit in DIRECTION_BITS.items() if not bits & bit]
     
     def get_wall_directions(self) -> list:
         """
@@ -52,7 +150,19 @@ class Cell:
         Returns:
             list: A list of the directions of the walls of the cell.
         """
-        return [key for key, value in self.walls.items() if value]
+        bits = self._grid[self._idx]
+        return [key for key, bit in DIRECTION_BITS.items() if bits & bit]
+
+    def __eq__(self, other) -> bool:
+        """
+        Two cells are equal if they view the same position of the same grid.
+        """
+        if not isinstance(other, Cell):
+            return NotImplemented
+        return self.row == other.row and self.col == other.col and self._grid is other._grid
+
+    def __hash__(self) -> int:
+        return hash((self.row, self.col))
 
     def __repr__(self) -> str:
         """
@@ -67,13 +177,14 @@ class Cell:
         out[:, 0] = '#'
         out[:, -1] = '#'
 
-        if not self.walls['N']:
+        walls = self.walls
+        if not walls['N']:
             out[0, 1:4] = ' '
-        if not self.walls['S']:
+        if not walls['S']:
             out[-1, 1:4] = ' '
-        if not self.walls['E']:
+        if not walls['E']:
             out[1:4, -1] = ' '
-        if not self.walls['W']:
+        if not walls['W']:
             out[1:4, 0] = ' '
         
         # If the cell is the start cell, mark it with 'S'
@@ -87,10 +198,11 @@ class Cell:
         return out
 
 class Maze:
-    def __init__(self, rows:int, cols:int, generator:callable=None, start_indices:tuple=None, target_indices:tuple=None) -> None:
+    def __init__(self, rows:int, cols:int, generator:callable=None, start_indices:tuple=None, target_indices:tuple=None, costs:np.ndarray=None, rng=None) -> None:
         """
         Initialize a maze with the given number of rows and columns.
-        The maze is represented as a 2D grid of cells.
+        The maze is represented as a 2D uint8 grid, with one byte per cell holding the
+        N/S/E/W wall bits and the visited/start/target flags. Cell objects are lightweight views on this grid.
         If a generator function is provided, it will be called to generate the maze.
 
         Args:
@@ -99,26 +211,72 @@ class Maze:
             generator; (callable): The generator function to generate the maze.
             start_indices; (tuple): The row and column indices of the start cell. Defaults to (0, 0).
             target_indices; (tuple): The row and column indices of the target cell. Defaults to (rows - 1, cols - 1).
+            costs; (np.ndarray): Optional (rows, cols) array of non-negative integer costs for entering each cell. Defaults to None (unit costs).
+            rng; (np.random.Generator): The random number generator passed to the generator. Defaults to the global np.random state.
         """
         self.rows:int = rows
         self.cols:int = cols
         self.generator:callable = generator
-        # Set the start and target indices
+        # Set the (optional) traversal costs
+        if costs is not None:
+            costs = np.asarray(costs)
+            if costs.shape != (rows, cols) or not np.issubdtype(costs.dtype, np.integer) or (costs < 0).any():
+                raise ValueError(f'costs must be a ({rows}, {cols}) array of non-negative integers.')
+        self.costs:np.ndarray = costs
+        # Direction tables of the (fixed) maze shape, built on first use and kept across resets
+        self._direction_offsets:list = None
+        self._legal_masks:list = None
+        # Initialize the maze with empty cells (all walls and not visited), and the start and target cells
+        self.grid:np.ndarray = np.empty((rows, cols), dtype=np.uint8)
+        self.reset(start_indices, target_indices)
+        # If a generator function is provided, call it to generate the maze
+        if self.generator:
+            self.generator.generate(self, rng)
+
+    def reset(self, start_indices:tuple=None, target_indices:tuple=None) -> None:
+        """
+        Restore every wall and clear the visited flags in-place, e.g. to generate a new maze in the same Maze object.
+
+        Args:
+            start_indices; (tuple): The row and column indices of the start cell. Defaults to (0, 0).
+            target_indices; (tuple): The row and column indices of the target cell. Defaults to (rows - 1, cols - 1).
+        """
         if start_indices is None:
             start_indices = (0, 0)
         self.start_indices:tuple = start_indices
         if target_indices is None:
-            target_indices = (rows - 1, cols - 1)
+            target_indices = (self.rows - 1, self.cols - 1)
         self.target_indices:tuple = target_indices
-        # Initialize the maze with empty cells (all walls and not visited)
-        self.cells:np.ndarray = np.array([[Cell(i, j) for j in range(cols)] for i in range(rows)])
-        # Set the start and target cells
-        self.cells[start_indices].is_start = True
-        self.cells[target_indices].is_target = True
-        # If a generator function is provided, call it to generate the maze
-        if self.generator:
-            self.generator.generate(self)
+        self.grid[...] = WALLS
+        self.grid[start_indices] |= START
+        self.grid[target_indices] |= TARGET
     
+    @classmethod
+    def from_walls(cls, walls:np.ndarray, start_indices:tuple=None, target_indices:tuple=None) -> 'Maze':
+        """
+        Create a (visited) maze from a wall bitmask, e.g. one maze of IGenerator.generate_batch.
+
+        Args:
+            walls; (np.ndarray): The (rows, cols) array with the N/S/E/W wall bits of each cell.
+            start_indices; (tuple): The row and column indices of the start cell. Defaults to (0, 0).
+            target_indices; (tuple): The row and column indices of the target cell. Defaults to (rows - 1, cols - 1).
+
+        Returns:
+            Maze: The maze with the given walls.
+        """
+        maze = cls(*walls.shape, start_indices=start_indices, target_indices=target_indices)
+        maze.set_walls(walls)
+        return maze
+
+    def set_walls(self, walls:np.ndarray) -> None:
+        """
+        Overwrite the wall bits of all cells, and mark all cells as visited.
+
+        Args:
+            walls; (np.ndarray): The (rows, cols) array with the N/S/E/W wall bits of each cell.
+        """
+        self.grid[...] = (self.grid & ~np.uint8(WALLS)) | (walls & WALLS) | VISITED
+
     def is_all_visited(self) -> bool:
         """
         Check if all cells in the maze have been visited.
@@ -126,7 +284,21 @@ class Maze:
         Returns:
             bool: True if all cells have been visited, False otherwise.
         """
-        return all([cell.visited for row in self.cells for cell in row])
+        return bool((self.grid & VISITED).all())
+
+    @property
+    def cells(self) -> np.ndarray:
+        """
+        Get a 2D object array of Cell views on the maze grid.
+        Building it creates rows*cols Cell objects, so prefer get_cell or the grid itself in hot loops.
+
+        Returns:
+            np.ndarray: The (rows, cols) array of cells.
+        """
+        cells = np.empty((self.rows, self.cols), dtype=object)
+        for i, j in np.ndindex(self.rows, self.cols):
+            cells[i, j] = Cell(i, j, grid=self.grid)
+        return cells
 
     def convert_direction(self, direction:str) -> tuple:
         """
@@ -178,7 +350,7 @@ class Maze:
         Returns:
             Cell: The cell at indices (row, col).
         """
-        return self.cells[row, col]
+        return Cell(row, col, grid=self.grid)
         
     def get_next_cell(self, cell:Cell, direction:str) -> Cell:
         """
@@ -192,8 +364,75 @@ class Maze:
             Cell: The next cell in the given direction.
         """
         d_row, d_col = self.convert_direction(direction)
-        return self.cells[cell.row + d_row, cell.col + d_col]
+        return Cell(cell.row + d_row, cell.col + d_col, grid=self.grid)
+
+    def remove_wall(self, row:int, col:int, direction:str) -> None:
+        """
+        Remove the wall between the cell at (row, col) and its neighbor in the given direction.
+        Both sides of the wall are removed.
+
+        Args:
+            row; (int): The row of the cell.
+            col; (int): The column of the cell.
+            direction; (str): The direction of the wall to remove. One of ['N', 'S', 'E', 'W'].
+        """
+        d_row, d_col = self.convert_direction(direction)
+        self.grid[row, col] &= ~DIRECTION_BITS[direction] & 0xFF
+        self.grid[row + d_row, col + d_col] &= ~OPPOSITE_BITS[direction] & 0xFF
+
+    def remove_walls(self, cell_ids:np.ndarray, direction:str) -> None:
+        """
+        Remove the walls between many cells and their neighbors in the same direction at once.
+        Both sides of each wall are removed.
+
+        Args:
+            cell_ids; (np.ndarray): The flat ids (row*cols+col) of the cells.
+            direction; (str): The direction of the walls to remove. One of ['N', 'S', 'E', 'W'].
+        """
+        d_row, d_col = self.convert_direction(direction)
+        flat_grid = self.grid.reshape(-1)
+        flat_grid[cell_ids] &= ~np.uint8(DIRECTION_BITS[direction])
+        flat_grid[cell_ids + d_row * self.cols + d_col] &= ~np.uint8(OPPOSITE_BITS[direction])
     
+    def get_direction_offsets(self) -> list:
+        """
+        Get the cell id offsets of the direction codes 0..3, for N, S, E, W (the order of DIRECTION_BITS).
+
+        Returns:
+            list: The [N, S, E, W] offsets of the flat cell ids (row*cols+col). Shared, do not modify.
+        """
+        if self._direction_offsets is None:
+            self._direction_offsets = [-self.cols, self.cols, 1, -1]
+        return self._direction_offsets
+
+    def get_legal_masks(self) -> list:
+        """
+        Get the in-bounds directions of every cell, e.g. to look up the neighbors of a cell id in a generator.
+
+        The table only depends on the maze shape, so it is built once and reused by every generate call on this maze.
+
+        Returns:
+            list: For each cell id, a 4-bit mask with bit k set if the neighbor in direction code k exists
+                (see MASK_DIRECTIONS). Shared, do not modify.
+        """
+        if self._legal_masks is None:
+            cell_rows, cell_cols = np.divmod(np.arange(self.rows * self.cols), self.cols)
+            self._legal_masks = ((cell_rows > 0) * 1 + (cell_rows < self.rows - 1) * 2
+                                 + (cell_cols < self.cols - 1) * 4 + (cell_cols > 0) * 8).tolist()
+        return self._legal_masks
+
+    def carve_from_parents(self, parent_direction:np.ndarray) -> None:
+        """
+        Remove the walls between every cell and its parent, one direction at a time, and mark all cells as visited.
+
+        Args:
+            parent_direction; (np.ndarray): The direction code (0..3 for N, S, E, W) from each cell id to its parent,
+                or -1 for cells without a parent (e.g. the root of a spanning tree).
+        """
+        for direction, key in enumerate(DIRECTION_BITS):
+            self.remove_walls(np.flatnonzero(parent_direction == direction), key)
+        self.grid |= VISITED
+
     def get_unvisited_neighbors_directions(self, cell:Cell) -> list[str]:
         """
         Get the directions from a given cell, to unvisible directions.
@@ -204,16 +443,17 @@ class Maze:
         Return:
             list of strings; either "N", "S", "E", "W"
         """
-        cell_idx = cell.row, cell.col
+        row, col = cell.row, cell.col
+        grid = self.grid
         # Get the neighbors of the cell that have not been visited yet
         neighbors = []
-        if cell_idx[0] > 0 and not self.cells[cell_idx[0] - 1, cell_idx[1]].visited:
+        if row > 0 and not grid[row - 1, col] & VISITED:
             neighbors.append("N")
-        if cell_idx[0] < self.rows - 1 and not self.cells[cell_idx[0] + 1, cell_idx[1]].visited:
+        if row < self.rows - 1 and not grid[row + 1, col] & VISITED:
             neighbors.append("S")
-        if cell_idx[1] > 0 and not self.cells[cell_idx[0], cell_idx[1] - 1].visited:
+        if col > 0 and not grid[row, col - 1] & VISITED:
             neighbors.append("W")
-        if cell_idx[1] < self.cols - 1 and not self.cells[cell_idx[0], cell_idx[1] + 1].visited:
+        if col < self.cols - 1 and not grid[row, col + 1] & VISITED:
             neighbors.append("E")
         
         return neighbors
@@ -253,7 +493,7 @@ class Maze:
 
         for i in range(self.rows):
             for j in range(self.cols):
-                cell = self.cells[i, j]
+                cell = self.get_cell(i, j)
                 out[i * 5: (i + 1) * 5, j * 5: (j + 1) * 5 ] = cell.__repr__()
         
         return '\n'.join([''.join(row) for row in out])
\ No newline at end of file
@@ -1,9 +1,10 @@
 from solvers.ISolver import ISolver
+from solvers.workspace import SolverWorkspace
 
 from maze import *
+from maze.Maze import N, S, E, W
 
 import heapq
-import numpy as np
 
 
 def manhattan_distance(current_indices, target_indices):
@@ -24,84 +25,77 @@ class ASolver(ISolver):
         """
         Initialize the A* Solver.
         """
-        pass
+        # Workspace reused by every solve without an explicit workspace
+        self.workspace = SolverWorkspace()
 
-    def reconstruct_path(self, came_from, current_cell):
-        """
-        Reconstruct the path from the start cell to the target cell.
-
-        Args:
-            came_from (dict): The dictionary containing the path from the start cell to the target cell.
-            current_cell (Cell): The current cell.
-
-        Returns:
-            list: The list of directions from the start cell to the target cell.
-        """
-        path = [current_cell]
-        while current_cell in came_from:
-            current_cell = came_from[current_cell]
-            path.append(current_cell)
-        
-        path = path[::-1]
-
-        return path
-
-    def solve(self, maze:Maze):
+    def solve(self, maze:Maze, workspace:SolverWorkspace=None):
         """
         Solve the maze using the A* algorithm.
 
+        The open set is a binary heap with lazy deletion: a cell may be pushed more than once,
+        and stale entries are skipped when popped. Cells are addressed by their flat id row*cols+col,
+        and the g-scores, came-from links and closed flags live in a SolverWorkspace, which is reused
+        across solves instead of being allocated and cleared for every maze.
+
         Args:
             maze (Maze): The maze to solve.
+            workspace (SolverWorkspace): The workspace to solve in. Defaults to the workspace of the solver.
         
         Returns:
-            list: A list of directions to solve the maze.
-            or 
-            numpy array of ones and zeros: A numpy array of the maze with the path to the target cell (ones).
+            list: A list of cells from the start cell to the target cell, or None if the target is unreachable.
         """
-        start_indices = maze.start_indices
-        target_indices = maze.target_indices
-
-        start_cell = maze.get_cell(*start_indices)
-        target_cell = maze.get_cell(*target_indices)
-
-        # Initialize the open and closed sets
-        open_set = set()
-        closed_set = set()
-        # add start cell to open set
-        open_set.add(start_cell)
-
-        # Initialize the g and f scores
-        g_scores = {cell: np.inf for row in maze.cells for cell in row}
-        g_scores[start_cell] = 0
-        f_scores = {cell: np.inf for row in maze.cells for cell in row}
-        f_scores[start_cell] = manhattan_distance(start_indices, target_indices)
-
-        # Initialize the came_from dictionary
-        came_from = {}
-
-        while open_set:
-            current_cell: Cell = min(open_set, key=lambda x: f_scores[x])
-            closed_set.add(current_cell)
-
-            if current_cell == target_cell:
-                return self.reconstruct_path(came_from, current_cell)
-                
-
-            for neighbor_cell in [maze.get_next_cell(current_cell, direction) for direction in current_cell.get_possible_neighbors()]:
-                if neighbor_cell is None or neighbor_cell in closed_set:
+        rows, cols = maze.rows, maze.cols
+        target_row, target_col = maze.target_indices
+
+        start_id = maze.start_indices[0] * cols + maze.start_indices[1]
+        target_id = target_row * cols + target_col
+
+        # Wall bits per cell id, and the id offset + wall bit for each direction
+        walls = maze.grid.ravel().tolist()
+        moves = ((-cols, N), (cols, S), (1, E), (-1, W))
+
+        # Start a new generation of the g-scores, came-from links and closed flags
+        workspace = self.workspace if workspace is None else workspace
+        generation = workspace.reset(rows * cols)
+        g_scores, came_from = workspace.distances, workspace.came_from
+        reached, closed = workspace.reached, workspace.closed
+        g_scores[start_id] = 0
+        came_from[start_id] = -1
+        reached[start_id] = generation
+
+        # Initialize the open set as a heap of (f-score, cell id)
+        open_heap = workspace.heap
+        open_heap.append((manhattan_distance(maze.start_indices, maze.target_indices), start_id))
+
+        while open_heap:
+            _, current_id = heapq.heappop(open_heap)
+            # Skip stale heap entries
+            if closed[current_id] == generation:
+                continue
+            closed[current_id] = generation
+
+            if current_id == target_id:
+                return self.reconstruct_path(maze, came_from, current_id)
+
+            tentative_g_score = g_scores[current_id] + 1
+            current_walls = walls[current_id]
+            for offset, wall in moves:
+                if current_walls & wall:
                     continue
-
-                tentative_g_score = g_scores[current_cell] + 1
-                if neighbor_cell not in open_set:
-                    open_set.add(neighbor_cell)
-                elif tentative_g_score >= g_scores[neighbor_cell]:
+                neighbor_id = current_id + offset
+                if closed[neighbor_id] == generation:
+                    continue
+                if reached[neighbor_id] == generation and tentative_g_score >= g_scores[neighbor_id]:
                     continue
 
-                came_from[neighbor_cell] = current_cell
-                g_scores[neighbor_cell] = tentative_g_score
-                f_scores[neighbor_cell] = g_scores[neighbor_cell] + manhattan_distance((neighbor_cell.row, neighbor_cell.col), target_indices)
+                came_from[neighbor_id] = current_id
+                g_scores[neighbor_id] = tentative_g_score
+                reached[neighbor_id] = generation
+                neighbor_row, neighbor_col = divmod(neighbor_id, cols)
+                f_score = tentative_g_score + abs(neighbor_row - target_row) + abs(neighbor_col - target_col)
+                heapq.heappush(open_heap, (f_score, neighbor_id))
 
-            open_set.remove(current_cell)
+        return None
 
     def solve_step(self, maze, **kwargs):
         pass
\ No newline at end of file
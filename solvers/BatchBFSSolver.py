@@ -0,0 +1,150 @@
+from solvers.ISolver import ISolver
+
+import numpy as np
+
+
+class BatchBFSSolver(ISolver):
+    def __init__(self):
+        """
+        Initialize the batched Breadth-First-Search Solver.
+
+        Solves a stack of pixel mazes (in the maze_to_npy format, 1 for walls and 0 for open pixels)
+        at once, by expanding the BFS frontiers of all mazes together with whole-array operations.
+        """
+        pass
+
+    def expand(self, mazes:np.ndarray, holes:np.ndarray, distances:np.ndarray):
+        """
+        Expand the BFS frontiers from the start holes, one pixel per step, until every maze has
+        reached its target hole or has no frontier left.
+
+        The frontier is kept as the flat ids of its pixels in a wall-padded copy of the batch, so a step
+        only touches the frontier pixels of the mazes that are still unsolved, not the whole (N, H, W) stack.
+
+        Args:
+            mazes (np.ndarray): The (N, H, W) uint8 pixel mazes.
+            holes (np.ndarray): The (N, 2, 2) pixel indices of the (start, target) holes of each maze.
+            distances (np.ndarray): (N, H, W) int32 array filled with -1. Updated in-place with the BFS distance from the start hole.
+
+        Yields:
+            tuple[np.ndarray]: The maze, row and column indices of the frontier pixels after each step.
+        """
+        n_mazes, height, width = mazes.shape
+        # Pad every maze with a wall border, so the neighbors of a pixel never leave its maze
+        padded_width = width + 2
+        plane = (height + 2) * padded_width
+        unvisited = np.zeros((n_mazes, height + 2, padded_width), dtype=bool)
+        unvisited[:, 1:-1, 1:-1] = mazes == 0
+        unvisited = unvisited.ravel()
+        offsets = np.array([-padded_width, padded_width, 1, -1])
+
+        batch = np.arange(n_mazes)
+        start_ids = batch * plane + (holes[:, 0, 0] + 1) * padded_width + holes[:, 0, 1] + 1
+        target_ids = batch * plane + (holes[:, 1, 0] + 1) * padded_width + holes[:, 1, 1] + 1
+
+        def to_indices(ids):
+            maze_idx, pixel = np.divmod(ids, plane)
+            rows, cols = np.divmod(pixel, padded_width)
+            return maze_idx, rows - 1, cols - 1
+
+        # A maze is solved once its (open) target hole has been visited
+        open_targets = unvisited[target_ids]
+        frontier = start_ids[unvisited[start_ids]]
+        unvisited[frontier] = False
+        indices = to_indices(frontier)
+        distances[indices] = 0
+        yield indices
+
+        done = open_targets & ~unvisited[target_ids]
+        step = 0
+        while len(frontier):
+            step += 1
+            # Drop the frontiers of the solved mazes
+            frontier = frontier[~done[frontier // plane]]
+            # Move the frontier one pixel in every direction, and keep the open, unvisited pixels
+            neighbors = (frontier[:, None] + offsets).ravel()
+            frontier = np.unique(neighbors[unvisited[neighbors]])
+            unvisited[frontier] = False
+            indices = to_indices(frontier)
+            distances[indices] = step
+
+            done |= open_targets & ~unvisited[target_ids]
+            yield indices
+
+    def solve(self, mazes:np.ndarray, holes:np.ndarray, return_solved:bool=False, out:np.ndarray=None):
+        """
+        Solve a stack of pixel mazes with a batched BFS.
+
+        The path masks are traced back from the target holes along decreasing BFS distances,
+        one pixel per step for all mazes at once. For perfect mazes they equal the path_to_npy masks.
+
+        Args:
+            mazes (np.ndarray): The (N, H, W) uint8 pixel mazes, as produced by maze_to_npy.
+            holes (np.ndarray): The (N, 2, 2) pixel indices of the (start, target) holes of each maze.
+            return_solved (bool): Whether to also return which mazes have a path from start to target.
+            out (np.ndarray): Optional (N, H, W) array to write the path masks into.
+
+        Returns:
+            np.ndarray: The (N, H, W) uint8 path masks (all zeros for unsolvable mazes).
+            optional: np.ndarray: The (N,) boolean array of solved mazes.
+        """
+        mazes = np.asarray(mazes)
+        holes = np.asarray(holes, dtype=np.intp).reshape(-1, 2, 2)
+        height, width = mazes.shape[1:]
+        batch = np.arange(len(mazes))
+
+        distances = np.full(mazes.shape, -1, dtype=np.int32)
+        for _ in self.expand(mazes, holes, distances):
+            pass
+
+        if out is None:
+            out = np.zeros(mazes.shape, dtype=np.uint8)
+        else:
+            out[...] = 0
+
+        # Trace the paths back from the target holes
+        rows, cols = holes[:, 1, 0].copy(), holes[:, 1, 1].copy()
+        current = distances[batch, rows, cols]
+        solved = current >= 0
+        out[batch[solved], rows[solved], cols[solved]] = 1
+
+        moves = ((-1, 0), (1, 0), (0, 1), (0, -1))
+        active = np.flatnonzero(current > 0)
+        while len(active):
+            found = np.zeros(len(active), dtype=bool)
+            next_rows, next_cols = rows[active], cols[active]
+            for d_row, d_col in moves:
+                neighbor_rows = np.clip(rows[active] + d_row, 0, height - 1)
+                neighbor_cols = np.clip(cols[active] + d_col, 0, width - 1)
+                step_back = ~found & (distances[active, neighbor_rows, neighbor_cols] == current[active] - 1)
+                next_rows[step_back] = neighbor_rows[step_back]
+                next_cols[step_back] = neighbor_cols[step_back]
+                found |= step_back
+
+            rows[active], cols[active] = next_rows, next_cols
+            current[active] -= 1
+            out[active, next_rows, next_cols] = 1
+            active = active[current[active] > 0]
+
+        if return_solved:
+            return out, solved
+        return out
+
+    def solve_step(self, mazes:np.ndarray, holes:np.ndarray, **kwargs):
+        """
+        Solve a stack of pixel mazes step by step, e.g. to visualize the search.
+
+        Args:
+            mazes (np.ndarray): The (N, H, W) uint8 pixel mazes.
+            holes (np.ndarray): The (N, 2, 2) pixel indices of the (start, target) holes of each maze.
+
+        Yields:
+            np.ndarray: The (N, H, W) boolean BFS frontier after each step.
+        """
+        mazes = np.asarray(mazes)
+        holes = np.asarray(holes, dtype=np.intp).reshape(-1, 2, 2)
+        distances = np.full(mazes.shape, -1, dtype=np.int32)
+        for indices in self.expand(mazes, holes, distances):
+            frontier = np.zeros(mazes.shape, dtype=bool)
+            frontier[indices] = True
+            yield frontier
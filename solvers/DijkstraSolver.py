@@ -1,5 +1,7 @@
 from solvers.ISolver import ISolver
-from maze.Maze import Maze, Cell
+from solvers.workspace import SolverWorkspace
+from maze.Maze import Maze, N, S, E, W
+
 
 
 class DijkstraSolver(ISolver):
@@ -7,7 +9,113 @@ class DijkstraSolver(ISolver):
         """
         Initialize the Dijkstra Solver.
         """
-        pass
+        # Workspace reused by every solve without an explicit workspace
+        self.workspace = SolverWorkspace()
+
+    def settle(self, maze:Maze, workspace:SolverWorkspace):
+        """
+        Run Dijkstra's algorithm from the start cell with a Dial-style bucket queue, and yield the id
+        (row*cols+col) of every cell as it is settled. Stops after the target cell is settled.
+
+        The cost of a move is the cost of the cell that is entered (maze.costs, or 1 if the maze has no costs).
+        With integer costs of at most C, every pending distance lies within [d, d + C] of the current
+        distance d, so C + 1 circular buckets suffice. The search runs in O(m + D) for m passages and a
+        maximum distance D, since every distance from 0 to D is visited once.
+
+        The distances and came-from links are left in the workspace, valid for the cells whose reached stamp
+        is the workspace generation.
+
+        Args:
+            maze (Maze): The maze to solve.
+            workspace (SolverWorkspace): The workspace to solve in. Reset by this method.
+        """
+        cols = maze.cols
+        start_id = maze.start_indices[0] * cols + maze.start_indices[1]
+        target_id = maze.target_indices[0] * cols + maze.target_indices[1]
+
+        # Wall bits and costs per cell id, and the id offset + wall bit for each direction
+        walls = maze.grid.ravel().tolist()
+        costs = [1] * len(walls) if maze.costs is None else maze.costs.ravel().tolist()
+        moves = ((-cols, N), (cols, S), (1, E), (-1, W))
+
+        # Circular bucket queue, indexed by distance modulo (max cost + 1)
+        n_buckets = max(costs, default=1) + 1
+        generation = workspace.reset(len(walls), n_buckets)
+        distances, came_from = workspace.distances, workspace.came_from
+        reached, settled = workspace.reached, workspace.closed
+        buckets = workspace.buckets
+        buckets[0].append(start_id)
+        distances[start_id] = 0
+        came_from[start_id] = -1
+        reached[start_id] = generation
+        pending = 1
+
+        distance = 0
+        while pending:
+            bucket = buckets[distance % n_buckets]
+            while bucket:
+                current_id = bucket.pop()
+                pending -= 1
+                # Skip stale entries (the cell was settled, or re-queued at a lower distance)
+                if settled[current_id] == generation or distances[current_id] != distance:
+                    continue
+                settled[current_id] = generation
+                yield current_id
+
+                if current_id == target_id:
+                    return
+
+                current_walls = walls[current_id]
+                for offset, wall in moves:
+                    if current_walls & wall:
+                        continue
+                    neighbor_id = current_id + offset
+                    if settled[neighbor_id] == generation:
+                        continue
+                    tentative_distance = distance + costs[neighbor_id]
+                    if reached[neighbor_id] == generation and tentative_distance >= distances[neighbor_id]:
+                        continue
+                    distances[neighbor_id] = tentative_distance
+                    came_from[neighbor_id] = current_id
+                    reached[neighbor_id] = generation
+                    buckets[tentative_distance % n_buckets].append(neighbor_id)
+                    pending += 1
+            distance += 1
+
+    def solve(self, maze:Maze, workspace:SolverWorkspace=None):
+        """
+        Solve the (weighted) maze using Dijkstra's algorithm with a bucket queue.
+
+        On a perfect maze the path between two cells is unique, so with unit costs this returns the same path
+        as ASolver. On mazes with loops both are shortest paths, but ties may be broken differently.
+
+        Args:
+            maze (Maze): The maze to solve. Uses maze.costs as per-cell costs, if set.
+            workspace (SolverWorkspace): The workspace to solve in. Defaults to the workspace of the solver.
+
+        Returns:
+            list: A list of cells from the start cell to the target cell, or None if the target is unreachable.
+        """
+        target_id = maze.target_indices[0] * maze.cols + maze.target_indices[1]
+        workspace = self.workspace if workspace is None else workspace
 
-    def solve(self, maze):
-        pass
\ No newline at end of file
+        for current_id in self.settle(maze, workspace):
+            pass
+
+        if current_id != target_id:
+            return None
+        return self.reconstruct_path(maze, workspace.came_from, target_id)
+
+    def solve_step(self, maze:Maze, **kwargs):
+        """
+        Solve the maze step by step, e.g. to visualize the search.
+
+        Args:
+            maze (Maze): The maze to solve.
+
+        Yields:
+            Cell: The cells in the order they are settled, ending with the target cell if it is reachable.
+        """
+        # A workspace of its own, since other solves may run in between the steps
+        for current_id in self.settle(maze, SolverWorkspace(maze.rows * maze.cols)):
+            yield maze.get_cell(*divmod(current_id, maze.cols))
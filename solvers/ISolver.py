@@ -10,4 +10,25 @@ class ISolver(ABC):
 
     @abstractmethod
     def solve_step(self, maze, **kwargs):
-        pass
\ No newline at end of file
+        pass
+
+    def reconstruct_path(self, maze, came_from, current_id:int):
+        """
+        Reconstruct the path from the start cell to the target cell.
+
+        Args:
+            maze (Maze): The maze that was solved.
+            came_from (np.ndarray): Flat array with, for each cell id (row*cols+col), the id of the cell it was reached from (-1 for the start cell).
+            current_id (int): The id of the target cell.
+
+        Returns:
+            list: The list of cells from the start cell to the target cell.
+        """
+        path = [current_id]
+        while came_from[current_id] >= 0:
+            current_id = int(came_from[current_id])
+            path.append(current_id)
+        
+        path = [maze.get_cell(*divmod(cell_id, maze.cols)) for cell_id in reversed(path)]
+
+        return path
\ No newline at end of file
@@ -1,4 +1,7 @@
 from solvers.DijkstraSolver import DijkstraSolver
 from solvers.ASolver import ASolver
+from solvers.BatchBFSSolver import BatchBFSSolver
+from solvers.workspace import SolverWorkspace
+from solvers.tree_path_index import TreePathIndex
 
-__all__ = ["DijkstraSolver", "ASolver"]
\ No newline at end of file
+__all__ = ["DijkstraSolver", "ASolver", "BatchBFSSolver", "SolverWorkspace", "TreePathIndex"]
\ No newline at end of file
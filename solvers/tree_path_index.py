@@ -0,0 +1,213 @@
+from maze.Maze import Maze, N, S, E, W
+
+import numpy as np
+
+
+class TreePathIndex:
+    def __init__(self, maze:Maze):
+        """
+        Build a path index over a perfect maze (a spanning tree of its cells), for path queries between any two cells.
+
+        The tree is rooted at cell (0, 0) with a breadth-first search (O(n)), which gives the parent and depth of every
+        cell. A binary lifting table (ancestors[k][id] is the 2**k-th ancestor of cell id) answers lowest common
+        ancestor queries in O(log n). It is only built by the first query that needs it (see build_ancestors), since
+        path queries only climb the parents. The path between two cells is unique, so it is the same path as ASolver finds.
+
+        Args:
+            maze (Maze): The (perfect) maze to index.
+        """
+        self.maze = maze
+        rows, cols = maze.rows, maze.cols
+        n_cells = rows * cols
+
+        # The open walls must form a tree: n-1 edges, connecting every cell
+        grid = maze.grid
+        n_edges = int(((grid[:, :-1] & E) == 0).sum() + ((grid[:-1, :] & S) == 0).sum())
+        if n_edges != n_cells - 1:
+            raise ValueError(f'TreePathIndex needs a perfect maze, but the maze has {n_edges} passages for {n_cells} cells.')
+
+        # Breadth-first search from the root, with the visit order as the queue
+        walls = grid.ravel().tolist()
+        moves = ((-cols, N), (cols, S), (1, E), (-1, W))
+        parents = [-1] * n_cells
+        depths = [0] * n_cells
+        parents[0] = 0
+        order = [0]
+        for current_id in order:
+            current_walls = walls[current_id]
+            next_depth = depths[current_id] + 1
+            for offset, wall in moves:
+                if current_walls & wall:
+                    continue
+                neighbor_id = current_id + offset
+                if parents[neighbor_id] < 0:
+                    parents[neighbor_id] = current_id
+                    depths[neighbor_id] = next_depth
+                    order.append(neighbor_id)
+        if len(order) != n_cells:
+            raise ValueError('TreePathIndex needs a perfect maze, but not every cell is reachable.')
+
+        # Lists for the scalar queries
+        self.parent_list = parents
+        self.depth_list = depths
+        # Binary lifting table, built on demand
+        self.depths = None
+        self.ancestors = None
+        self.ancestor_lists = None
+
+    def build_ancestors(self) -> None:
+        """
+        Build the binary lifting table (O(n log n)), if it was not built yet. Needed for the LCA and distance queries.
+        """
+        if self.ancestors is not None:
+            return
+        # One level per bit of the largest depth
+        self.depths = np.array(self.depth_list, dtype=np.int64)
+        n_levels = max(1, max(self.depth_list).bit_length())
+        ancestors = np.empty((n_levels, len(self.parent_list)), dtype=np.int64)
+        ancestors[0] = self.parent_list
+        for level in range(1, n_levels):
+            ancestors[level] = ancestors[level - 1][ancestors[level - 1]]
+        self.ancestors = ancestors
+        self.ancestor_lists = ancestors.tolist()
+
+    def get_id(self, indices:tuple) -> int:
+        """
+        Get the id (row*cols+col) of the cell at the given row and column indices.
+        """
+        return indices[0] * self.maze.cols + indices[1]
+
+    def lowest_common_ancestor(self, first_id:int, second_id:int) -> int:
+        """
+        Get the lowest common ancestor of two cells, in O(log n).
+
+        Args:
+            first_id (int): The id (row*cols+col) of the first cell.
+            second_id (int): The id of the second cell.
+
+        Returns:
+            int: The id of the lowest common ancestor.
+        """
+        self.build_ancestors()
+        depths, ancestors = self.depth_list, self.ancestor_lists
+        if depths[first_id] < depths[second_id]:
+            first_id, second_id = second_id, first_id
+
+        # Lift the deeper cell to the depth of the other one
+        difference = depths[first_id] - depths[second_id]
+        level = 0
+        while difference:
+            if difference & 1:
+                first_id = ancestors[level][first_id]
+            difference >>= 1
+            level += 1
+        if first_id == second_id:
+            return first_id
+
+        # Lift both cells to just below their lowest common ancestor
+        for level in reversed(range(len(ancestors))):
+            if ancestors[level][first_id] != ancestors[level][second_id]:
+                first_id = ancestors[level][first_id]
+                second_id = ancestors[level][second_id]
+        return ancestors[0][first_id]
+
+    def distance(self, start_indices:tuple, target_indices:tuple) -> int:
+        """
+        Get the number of moves on the path between two cells, in O(log n).
+
+        Args:
+            start_indices (tuple): The row and column indices of the start cell.
+            target_indices (tuple): The row and column indices of the target cell.
+
+        Returns:
+            int: The distance between the cells.
+        """
+        start_id, target_id = self.get_id(start_indices), self.get_id(target_indices)
+        ancestor_id = self.lowest_common_ancestor(start_id, target_id)
+        return self.depth_list[start_id] + self.depth_list[target_id] - 2 * self.depth_list[ancestor_id]
+
+    def distances(self, start_indices:np.ndarray, target_indices:np.ndarray) -> np.ndarray:
+        """
+        Get the distances between many pairs of cells at once, vectorized over the pairs.
+
+        Args:
+            start_indices (np.ndarray): The (k, 2) row and column indices of the start cells.
+            target_indices (np.ndarray): The (k, 2) row and column indices of the target cells.
+
+        Returns:
+            np.ndarray: The (k,) distances.
+        """
+        cols = self.maze.cols
+        first = np.asarray(start_indices)[:, 0] * cols + np.asarray(start_indices)[:, 1]
+        second = np.asarray(target_indices)[:, 0] * cols + np.asarray(target_indices)[:, 1]
+        self.build_ancestors()
+        depths, ancestors = self.depths, self.ancestors
+
+        # Lift the deeper cell of every pair to the depth of the other one
+        swap = depths[first] < depths[second]
+        first, second = np.where(swap, second, first), np.where(swap, first, second)
+        difference = depths[first] - depths[second]
+        second_depths = depths[second]
+        for level in range(len(ancestors)):
+            first = np.where((difference >> level) & 1, ancestors[level][first], first)
+
+        # Lift both cells to just below their lowest common ancestor
+        for level in reversed(range(len(ancestors))):
+            differ = ancestors[level][first] != ancestors[level][second]
+            first = np.where(differ, ancestors[level][first], first)
+            second = np.where(differ, ancestors[level][second], second)
+        common = np.where(first == second, first, ancestors[0][first])
+
+        return difference + 2 * (second_depths - depths[common])
+
+    def path_ids(self, start_indices:tuple, target_indices:tuple) -> list:
+        """
+        Get the ids of the cells on the path between two cells, in time proportional to the path length.
+
+        Args:
+            start_indices (tuple): The row and column indices of the start cell.
+            target_indices (tuple): The row and column indices of the target cell.
+
+        Returns:
+            list: The cell ids (row*cols+col) from the start cell to the target cell.
+        """
+        start_id, target_id = self.get_id(start_indices), self.get_id(target_indices)
+        parents, depths = self.parent_list, self.depth_list
+
+        # Climb from both ends until they meet at the lowest common ancestor
+        start_side, target_side = [start_id], [target_id]
+        while start_id != target_id:
+            if depths[start_id] >= depths[target_id]:
+                start_id = parents[start_id]
+                start_side.append(start_id)
+            else:
+                target_id = parents[target_id]
+                target_side.append(target_id)
+        return start_side + target_side[-2::-1]
+
+    def path(self, start_indices:tuple, target_indices:tuple) -> list:
+        """
+        Get the path between two cells, like ASolver.solve.
+
+        Args:
+            start_indices (tuple): The row and column indices of the start cell.
+            target_indices (tuple): The row and column indices of the target cell.
+
+        Returns:
+            list: A list of cells from the start cell to the target cell.
+        """
+        cols = self.maze.cols
+        return [self.maze.get_cell(*divmod(cell_id, cols)) for cell_id in self.path_ids(start_indices, target_indices)]
+
+    def path_indices(self, start_indices:tuple, target_indices:tuple) -> np.ndarray:
+        """
+        Get the path between two cells as an array of cell indices, e.g. for path_to_npy.
+
+        Args:
+            start_indices (tuple): The row and column indices of the start cell.
+            target_indices (tuple): The row and column indices of the target cell.
+
+        Returns:
+            np.ndarray: The (k, 2) row and column indices of the cells from the start cell to the target cell.
+        """
+        return np.stack(np.divmod(np.array(self.path_ids(start_indices, target_indices)), self.maze.cols), axis=1)
@@ -0,0 +1,61 @@
+class SolverWorkspace:
+    """
+    Reusable scratch space for solving many mazes, e.g. a stream of same-size mazes.
+
+    Holds per-cell distance, came-from and stamp lists (indexed by cell id row*cols+col), and the heap or
+    buckets of the search. Instead of clearing the lists between solves, every solve gets a new generation
+    number: a cell's distance and came-from link are only valid if its reached stamp equals the current
+    generation, and it is only settled if its closed stamp does.
+    """
+    def __init__(self, n_cells:int=0) -> None:
+        """
+        Initialize the workspace.
+
+        Args:
+            n_cells (int): The number of cells to preallocate for. Grows on demand.
+        """
+        self.n_cells = 0
+        self.distances = []
+        self.came_from = []
+        self.reached = []
+        self.closed = []
+        self.heap = []
+        self.buckets = []
+        self.generation = 0
+        self.grow(n_cells)
+
+    def grow(self, n_cells:int) -> None:
+        """
+        Make room for mazes with up to n_cells cells.
+
+        Args:
+            n_cells (int): The number of cells.
+        """
+        if n_cells <= self.n_cells:
+            return
+        extra = n_cells - self.n_cells
+        self.distances.extend([0] * extra)
+        self.came_from.extend([-1] * extra)
+        self.reached.extend([0] * extra)
+        self.closed.extend([0] * extra)
+        self.n_cells = n_cells
+
+    def reset(self, n_cells:int, n_buckets:int=0) -> int:
+        """
+        Start a new solve, invalidating everything from the previous one in O(1) (plus emptying the heap and buckets).
+
+        Args:
+            n_cells (int): The number of cells of the maze.
+            n_buckets (int): The number of buckets needed by the search (see DijkstraSolver.settle).
+
+        Returns:
+            int: The generation of the new solve.
+        """
+        self.grow(n_cells)
+        self.heap.clear()
+        for bucket in self.buckets:
+            bucket.clear()
+        if len(self.buckets) < n_buckets:
+            self.buckets.extend([] for _ in range(n_buckets - len(self.buckets)))
+        self.generation += 1
+        return self.generation
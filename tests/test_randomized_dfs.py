@@ -0,0 +1,67 @@
+from generators import RandomizedDFS
+from maze import Maze
+from maze.Maze import N, S, E, W
+
+import numpy as np
+import pytest
+
+
+BIASES = [0.0, 0.25, 0.5, 0.75, 1.0]
+NAMES = ['N', 'S', 'E', 'W']
+BITS = [N, S, E, W]
+MOVES = [(-1, 0), (1, 0), (0, 1), (0, -1)]
+
+
+def normalised_probabilities(bias, directions):
+    """
+    The per-step probabilities of the original RandomizedDFS: look up the weights, fall back to uniform
+    if they are all 0, then normalise.
+    """
+    probability_lookup = {'N': 1 - bias, 'S': 1 - bias, 'E': bias, 'W': bias}
+    probabilities = [probability_lookup[direction] for direction in directions]
+    if sum(probabilities) == 0:
+        probabilities = [1 for _ in probabilities]
+    return [p / sum(probabilities) for p in probabilities]
+
+
+@pytest.mark.parametrize('bias', BIASES)
+def test_table_matches_normalised_probabilities(bias):
+    table = RandomizedDFS(bias).cumulative_probabilities
+    assert table[0] == []
+    for mask in range(1, 16):
+        directions = [NAMES[direction] for direction in range(4) if mask & (1 << direction)]
+        # The probability of a direction is the step between consecutive thresholds
+        thresholds = [min(threshold, 1.0) for _, threshold in table[mask]]
+        assert [NAMES[direction] for direction, _ in table[mask]] == directions
+        np.testing.assert_allclose(np.diff([0.0] + thresholds), normalised_probabilities(bias, directions))
+
+
+@pytest.mark.parametrize('bias', [0.25, 0.75])
+def test_sampled_direction_frequencies(bias):
+    # In a 3x3 maze started from the center, the DFS takes one step out of the center and then has to go around
+    # the ring of the other 8 cells, so the center keeps a single passage: the first choice (from all 4 directions).
+    # The cell it leads to keeps one of its two perpendicular passages: the second choice, between N and S
+    # (after a horizontal first step) or E and W (after a vertical one).
+    generator = RandomizedDFS(bias)
+    rng = np.random.default_rng(0)
+    n_mazes = 4000
+    first_counts = np.zeros(4)
+    second_counts = {(0, 1): np.zeros(2), (2, 3): np.zeros(2)}
+    for _ in range(n_mazes):
+        maze = Maze(3, 3, start_indices=(1, 1))
+        generator.generate(maze, rng)
+        grid = maze.grid
+        first = [direction for direction in range(4) if not grid[1, 1] & BITS[direction]]
+        assert len(first) == 1
+        first_counts[first[0]] += 1
+
+        row, col = 1 + MOVES[first[0]][0], 1 + MOVES[first[0]][1]
+        pair = (2, 3) if first[0] < 2 else (0, 1)
+        second = [k for k, direction in enumerate(pair) if not grid[row, col] & BITS[direction]]
+        assert len(second) == 1
+        second_counts[pair][second[0]] += 1
+
+    np.testing.assert_allclose(first_counts / n_mazes, normalised_probabilities(bias, NAMES), atol=0.03)
+    for pair, counts in second_counts.items():
+        expected = normalised_probabilities(bias, [NAMES[direction] for direction in pair])
+        np.testing.assert_allclose(counts / counts.sum(), expected, atol=0.03)
@@ -1,5 +1,15 @@
-from .create_dataset import create_dataset, maze_to_npy, path_to_npy
+from .create_dataset import create_dataset, iter_dataset, iter_mazes, create_maze, create_sample, create_chunk, write_dataset, get_endpoint_pairs, create_pair_samples, iter_pair_samples, get_sample_rng, get_endpoints, maze_to_npy, path_to_npy, walls_to_npy, get_hole
+from .dataset_writer import DatasetWriter
+from .shards import ShardedDataset, load_manifest, save_manifest, get_shard_path, get_checksum
+from .maze_dataset import MazeDataset
+from .virtual_dataset import VirtualDataset
+from .compact import CompactDataset, save_compact, pack_mazes, unpack_mazes
 from .plotting import plot_maze_from_npy, plot_path_from_npy, plot_maze_and_path
 
-__all__ = ['create_dataset','maze_to_npy', 'path_to_npy',
+__all__ = ['create_dataset', 'iter_dataset', 'iter_mazes', 'create_maze', 'create_sample', 'create_chunk', 'write_dataset',
+           'get_sample_rng', 'get_endpoints', 'get_endpoint_pairs', 'create_pair_samples', 'iter_pair_samples',
+           'DatasetWriter', 'MazeDataset', 'VirtualDataset',
+           'ShardedDataset', 'load_manifest', 'save_manifest', 'get_shard_path', 'get_checksum',
+           'CompactDataset', 'save_compact', 'pack_mazes', 'unpack_mazes',
+           'maze_to_npy', 'path_to_npy', 'walls_to_npy', 'get_hole',
            'plot_maze_from_npy', 'plot_path_from_npy', 'plot_maze_and_path']
\ No newline at end of file
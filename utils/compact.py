@@ -0,0 +1,306 @@
+import numpy as np
+
+
+def border_indices(height: int, width: int):
+    """
+    Get the pixel indices of the outer walls of a pixel maze, without the corners.
+
+    Args:
+        height (int): The height of the pixel maze (2*rows+1).
+        width (int): The width of the pixel maze (2*cols+1).
+
+    Returns:
+        tuple[np.ndarray]: The row and column indices of the border pixels.
+    """
+    cols = np.arange(1, width - 1)
+    rows = np.arange(1, height - 1)
+    border_rows = np.concatenate([np.zeros_like(cols), rows, rows, np.full_like(cols, height - 1)])
+    border_cols = np.concatenate([cols, np.zeros_like(rows), np.full_like(rows, width - 1), cols])
+    return border_rows, border_cols
+
+def find_holes(maze_arrays: np.ndarray):
+    """
+    Find the two holes in the outer walls of a stack of pixel mazes.
+
+    Args:
+        maze_arrays (np.ndarray): The (N, H, W) pixel mazes.
+
+    Returns:
+        np.ndarray: The (N, 2, 2) pixel indices of the holes of each maze, in row-major order.
+    """
+    border_rows, border_cols = border_indices(*maze_arrays.shape[1:])
+    order = np.lexsort((border_cols, border_rows))
+    border_rows, border_cols = border_rows[order], border_cols[order]
+
+    maze_idx, border_idx = np.nonzero(maze_arrays[:, border_rows, border_cols] == 0)
+    if len(maze_idx) != 2 * len(maze_arrays) or (np.bincount(maze_idx, minlength=len(maze_arrays)) != 2).any():
+        raise ValueError('Every maze must have exactly two holes in its outer walls.')
+    return np.stack([border_rows[border_idx], border_cols[border_idx]], axis=-1).reshape(-1, 2, 2)
+
+def pack_mazes(maze_arrays: np.ndarray):
+    """
+    Pack a stack of pixel mazes (in the maze_to_npy format) into their interior wall bits.
+
+    Only the east walls (of all but the last column) and the south walls (of all but the last row) are stored,
+    with np.packbits. All other pixels are fixed, except for the two holes in the outer walls.
+
+    Args:
+        maze_arrays (np.ndarray): The (N, 2*rows+1, 2*cols+1) pixel mazes.
+
+    Returns:
+        np.ndarray: The (N, n_bytes) packed wall bits.
+        np.ndarray: The (N, 2, 2) pixel indices of the holes of each maze.
+    """
+    east = maze_arrays[:, 1:-1:2, 2:-1:2].reshape(len(maze_arrays), -1)
+    south = maze_arrays[:, 2:-1:2, 1:-1:2].reshape(len(maze_arrays), -1)
+    walls = np.packbits(np.concatenate([east, south], axis=1).astype(bool), axis=1)
+    return walls, find_holes(maze_arrays).astype(np.uint16)
+
+def unpack_mazes(walls: np.ndarray, holes: np.ndarray, rows: int, cols: int, out: np.ndarray = None):
+    """
+    Rebuild the pixel mazes (identical to maze_to_npy) from their packed wall bits and holes.
+
+    Args:
+        walls (np.ndarray): The (N, n_bytes) packed wall bits.
+        holes (np.ndarray): The (N, 2, 2) pixel indices of the holes of each maze.
+        rows (int): The number of rows of the mazes.
+        cols (int): The number of columns of the mazes.
+        out (np.ndarray): Optional (N, 2*rows+1, 2*cols+1) array to write the pixel mazes into.
+
+    Returns:
+        np.ndarray: The (N, 2*rows+1, 2*cols+1) uint8 pixel mazes.
+    """
+    n_east = rows * (cols - 1)
+    bits = np.unpackbits(walls, axis=1, count=n_east + (rows - 1) * cols)
+    if out is None:
+        out = np.empty((len(walls), 2*rows+1, 2*cols+1), dtype=np.uint8)
+
+    # Fixed pixels: walls everywhere, except for the cells
+    out[...] = 1
+    out[:, 1::2, 1::2] = 0
+    # Interior walls
+    out[:, 1:-1:2, 2:-1:2] = bits[:, :n_east].reshape(-1, rows, cols - 1)
+    out[:, 2:-1:2, 1:-1:2] = bits[:, n_east:].reshape(-1, rows - 1, cols)
+    # Holes in the outer walls
+    holes = holes.astype(np.intp)
+    batch = np.arange(len(walls))
+    out[batch, holes[:, 0, 0], holes[:, 0, 1]] = 0
+    out[batch, holes[:, 1, 0], holes[:, 1, 1]] = 0
+    return out
+
+# Cell offsets of the direction codes N, S, E, W (the order of DIRECTION_BITS)
+DIRECTION_DELTAS = np.array([(-1, 0), (1, 0), (0, 1), (0, -1)], dtype=np.intp)
+OPPOSITE_CODES = np.array([1, 0, 3, 2], dtype=np.intp)
+
+def get_hole_cells(holes: np.ndarray, height: int, width: int):
+    """
+    Get the pixel of the cell next to each hole, and the direction code pointing from that cell to the hole.
+
+    Args:
+        holes (np.ndarray): The (N, 2) pixel indices of the holes.
+        height (int): The height of the pixel mazes.
+        width (int): The width of the pixel mazes.
+
+    Returns:
+        np.ndarray: The (N, 2) pixel indices of the cells next to the holes.
+        np.ndarray: The (N,) direction codes from the cells to the holes.
+    """
+    holes = holes.astype(np.intp)
+    codes = np.select([holes[:, 0] == 0, holes[:, 0] == height - 1, holes[:, 1] == width - 1], [0, 1, 2], 3)
+    return holes - DIRECTION_DELTAS[codes], codes
+
+def encode_paths(path_masks: np.ndarray, holes: np.ndarray):
+    """
+    Encode a stack of path masks (in the path_to_npy format) as sequences of direction codes.
+
+    Every path is traced from the cell next to its first hole to the cell next to its second hole,
+    for all paths at once, and each move between cells is stored as a direction code (0-3 for N, S, E, W).
+
+    Args:
+        path_masks (np.ndarray): The (N, H, W) path masks.
+        holes (np.ndarray): The (N, 2, 2) pixel indices of the holes of each maze (see find_holes).
+
+    Returns:
+        np.ndarray: The uint8 direction codes of all paths, concatenated.
+        np.ndarray: The (N,) number of moves of each path.
+    """
+    n_paths, height, width = path_masks.shape
+    position, back = get_hole_cells(holes[:, 0], height, width)
+    active = np.arange(n_paths)
+    steps = []
+    while len(active):
+        # the path continues in the one direction that is set and doesn't lead back
+        neighbors = position[active, None] + DIRECTION_DELTAS
+        is_open = path_masks[active[:, None], neighbors[..., 0], neighbors[..., 1]] != 0
+        is_open[np.arange(len(active)), back[active]] = False
+        if not is_open.any(axis=1).all():
+            raise ValueError('Every path mask must connect the two holes of its maze.')
+        direction = is_open.argmax(axis=1)
+
+        # stop when reaching the outer walls (the second hole)
+        wall = neighbors[np.arange(len(active)), direction]
+        done = (wall[:, 0] == 0) | (wall[:, 0] == height - 1) | (wall[:, 1] == 0) | (wall[:, 1] == width - 1)
+        active, direction = active[~done], direction[~done]
+
+        step = np.full(n_paths, -1, dtype=np.int8)
+        step[active] = direction
+        steps.append(step)
+        position[active] += 2 * DIRECTION_DELTAS[direction]
+        back[active] = OPPOSITE_CODES[direction]
+
+    # (steps, paths) -> codes ordered by path, then by step
+    steps = np.stack(steps, axis=1) if steps else np.empty((n_paths, 0), dtype=np.int8)
+    return steps[steps >= 0].astype(np.uint8), (steps >= 0).sum(axis=1)
+
+def pack_codes(codes: np.ndarray):
+    """
+    Pack direction codes into bytes, four 2-bit codes per byte.
+
+    Args:
+        codes (np.ndarray): The direction codes (0-3).
+
+    Returns:
+        np.ndarray: The packed uint8 codes.
+    """
+    padded = np.zeros(-(-len(codes) // 4) * 4, dtype=np.uint8)
+    padded[:len(codes)] = codes
+    padded = padded.reshape(-1, 4)
+    return (padded[:, 0] << 6) | (padded[:, 1] << 4) | (padded[:, 2] << 2) | padded[:, 3]
+
+def decode_paths(codes: np.ndarray, starts: np.ndarray, lengths: np.ndarray, holes: np.ndarray, rows: int, cols: int, out: np.ndarray = None):
+    """
+    Rebuild the path masks (identical to path_to_npy) of a batch of paths from their packed direction codes.
+
+    The codes are read straight from the packed bytes, and the cells of all paths are found at once
+    with a cumulative sum of the moves, restarted at the beginning of each path.
+
+    Args:
+        codes (np.ndarray): The packed direction codes of all paths (see pack_codes).
+        starts (np.ndarray): The (N,) index of the first code of each path.
+        lengths (np.ndarray): The (N,) number of moves of each path.
+        holes (np.ndarray): The (N, 2, 2) pixel indices of the holes of each maze.
+        rows (int): The number of rows of the mazes.
+        cols (int): The number of columns of the mazes.
+        out (np.ndarray): Optional (N, 2*rows+1, 2*cols+1) array to write the path masks into.
+
+    Returns:
+        np.ndarray: The (N, 2*rows+1, 2*cols+1) uint8 path masks.
+    """
+    height, width = 2 * rows + 1, 2 * cols + 1
+    if out is None:
+        out = np.empty((len(starts), height, width), dtype=np.uint8)
+    out[...] = 0
+
+    # index of every code of the batch in the code stream
+    lengths = np.asarray(lengths, dtype=np.intp)
+    ends = np.cumsum(lengths)
+    path_ids = np.repeat(np.arange(len(lengths)), lengths)
+    positions = np.asarray(starts, dtype=np.intp)[path_ids] + np.arange(ends[-1] if len(ends) else 0) - (ends - lengths)[path_ids]
+    moves = DIRECTION_DELTAS[(codes[positions // 4] >> (6 - 2 * (positions % 4))) & 3]
+
+    # cell pixels, relative to the first cell of each path
+    pixels = np.cumsum(2 * moves, axis=0)
+    pixels -= np.concatenate([np.zeros((1, 2), dtype=np.intp), pixels])[(ends - lengths)[path_ids]]
+    first, _ = get_hole_cells(holes[:, 0], height, width)
+    pixels += first[path_ids]
+
+    batch = np.arange(len(starts))
+    out[batch, first[:, 0], first[:, 1]] = 1
+    out[path_ids, pixels[:, 0], pixels[:, 1]] = 1
+    out[path_ids, pixels[:, 0] - moves[:, 0], pixels[:, 1] - moves[:, 1]] = 1
+    holes = holes.astype(np.intp)
+    out[batch, holes[:, 0, 0], holes[:, 0, 1]] = 1
+    out[batch, holes[:, 1, 0], holes[:, 1, 1]] = 1
+    return out
+
+def save_compact(filename: str, dataset, batch_size: int = 4096):
+    """
+    Save a dataset of (maze, path) samples in the compact format: packed wall bits, holes and packed path direction codes,
+    with the number of moves of each path.
+
+    Args:
+        filename (str): The .npz file to write.
+        dataset (np.ndarray | iterable): An (N, 2, H, W) dataset (e.g. a memmap), or an iterable of (k, 2, H, W) chunks (e.g. from iter_dataset).
+        batch_size (int): The number of samples to pack at a time, if dataset is an array.
+    """
+    if isinstance(dataset, np.ndarray):
+        dataset = np.array_split(dataset, range(batch_size, len(dataset), batch_size))
+
+    walls, holes, codes, lengths = [], [], [], []
+    shape = None
+    for chunk in dataset:
+        shape = chunk.shape[2:]
+        chunk_walls, chunk_holes = pack_mazes(chunk[:, 0])
+        chunk_codes, chunk_lengths = encode_paths(chunk[:, 1], chunk_holes)
+        walls.append(chunk_walls)
+        holes.append(chunk_holes)
+        codes.append(chunk_codes)
+        lengths.append(chunk_lengths)
+
+    np.savez(filename, walls=np.concatenate(walls), holes=np.concatenate(holes),
+             paths=pack_codes(np.concatenate(codes)), lengths=np.concatenate(lengths).astype(np.uint32),
+             shape=np.array([(shape[0] - 1) // 2, (shape[1] - 1) // 2]))
+
+
+class CompactDataset:
+    """
+    Dataset in the compact format (see save_compact), that rebuilds the pixel mazes and paths on demand.
+    """
+    def __init__(self, filename: str) -> None:
+        """
+        Load the compact dataset.
+
+        Args:
+            filename (str): The .npz file written by save_compact.
+        """
+        data = np.load(filename)
+        self.walls = data['walls']
+        self.holes = data['holes']
+        self.paths = data['paths']
+        self.lengths = data['lengths']
+        self.starts = np.concatenate([[0], np.cumsum(self.lengths[:-1], dtype=np.int64)])
+        self.rows, self.cols = data['shape'].tolist()
+
+    def __len__(self) -> int:
+        return len(self.walls)
+
+    @property
+    def path_lengths(self) -> np.ndarray:
+        """
+        The number of cells on each solution path, without decoding the paths.
+        """
+        return self.lengths.astype(np.int64) + 1
+
+    def __getitem__(self, index):
+        """
+        Rebuild the samples at the given index, slice or index array.
+
+        Args:
+            index (int | slice | np.ndarray): The samples to rebuild.
+
+        Returns:
+            np.ndarray: The (2, H, W) sample, or (k, 2, H, W) samples, identical to the samples of create_dataset.
+        """
+        single = np.isscalar(index)
+        walls = self.walls[index].reshape(-1, self.walls.shape[1])
+        holes = self.holes[index].reshape(-1, 2, 2)
+        starts = self.starts[index].reshape(-1)
+        lengths = self.lengths[index].reshape(-1)
+
+        samples = np.empty((len(walls), 2, 2 * self.rows + 1, 2 * self.cols + 1), dtype=np.uint8)
+        unpack_mazes(walls, holes, self.rows, self.cols, out=samples[:, 0])
+        decode_paths(self.paths, starts, lengths, holes, self.rows, self.cols, out=samples[:, 1])
+        return samples[0] if single else samples
+
+    def iter_batches(self, batch_size: int):
+        """
+        Rebuild the samples one batch at a time.
+
+        Args:
+            batch_size (int): The number of samples per batch.
+
+        Yields:
+            np.ndarray: The (k, 2, H, W) batches of samples.
+        """
+        for start in range(0, len(self), batch_size):
+            yield self[start:start + batch_size]
@@ -1,134 +1,396 @@
 from maze import *
+from maze.Maze import N, S, E, W
 from generators import *
-from solvers import ASolver
+from solvers import ASolver, TreePathIndex
 
 import numpy as np
-from tqdm import trange
+from tqdm import tqdm, trange
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import queue
 import threading
 
-def path_to_npy(path: list[Cell], maze_array: np.ndarray, holes: list[tuple[int]] = []):
+def path_to_npy(path: list[Cell], maze_array: np.ndarray, holes: list[tuple[int]] = [], out: np.ndarray = None):
     """
     Convert a path to a numpy array of 1s and 0s.
 
     Where 1s represent the path and 0s represent the unvisited cells.
+    The path cells are mapped to pixels (2*row+1, 2*col+1), and the pixels in between
+    consecutive cells are found with index arithmetic (no per-cell Python loop).
     
     Args:
-        path (list[Cell]): The path to convert.
+        path (list[Cell] | np.ndarray): The path to convert. Either a list of cells, or a (k, 2) array of cell indices.
         maze_array (np.ndarray): The maze as a numpy array.
         holes (list[tuple[int]]): The holes in the outer walls of the maze.
+        out (np.ndarray): Optional (2*rows+1, 2*cols+1) array to write the path into, e.g. a slice of a preallocated batch.
 
     Returns:
-        np.ndarray: The path as a numpy array.
+        np.ndarray: The path as a uint8 numpy array.
     """
-    rows = maze_array.shape[0]
-    cols = maze_array.shape[1]
-    path_array = np.zeros((rows, cols), dtype=int)
+    if out is None:
+        out = np.zeros(maze_array.shape, dtype=np.uint8)
+    else:
+        out[...] = 0
 
     # find holes in the outer walls of the maze
     if holes:
-        path_array[holes[0][0], holes[0][1]] = 1
-        path_array[holes[1][0], holes[1][1]] = 1
+        for hole in holes:
+            if hole is not None:
+                out[hole] = 1
     else:
-        for i in range(rows):
-            if maze_array[i, 0] == 0:
-                path_array[i, 0] = 1
-            if maze_array[i, cols-1] == 0:
-                path_array[i, cols-1] = 1
-        for j in range(cols):
-            if maze_array[0, j] == 0:
-                path_array[0, j] = 1
-            if maze_array[rows-1, j] == 0:
-                path_array[rows-1, j] = 1
-
-    current_cell = path[0]
-
-    for cell in path[1:]:
-        # draw a line from the current cell to the next cell
-        if current_cell.row == cell.row:
-            # move horizontally
-            row = 2*current_cell.row+1
-            start_col = 2 * min(current_cell.col, cell.col) + 1
-            end_col = 2 * max(current_cell.col, cell.col) + 2
-            path_array[row, start_col:end_col] = 1
-        else:
-            # move vertically
-            col = 2*current_cell.col+1
-            start_row = 2 * min(current_cell.row, cell.row) + 1
-            end_row = 2 * max(current_cell.row, cell.row) + 2
-            path_array[start_row:end_row, col] = 1
+        out[:, 0] = maze_array[:, 0] == 0
+        out[:, -1] = maze_array[:, -1] == 0
+        out[0, :] |= maze_array[0, :] == 0
+        out[-1, :] |= maze_array[-1, :] == 0
 
-        current_cell = cell
-    
-    return path_array
+    if not isinstance(path, np.ndarray):
+        path = np.array([(cell.row, cell.col) for cell in path], dtype=np.intp)
+
+    # cell centers, and the (wall) pixels in between consecutive cells
+    pixels = 2 * path.reshape(-1, 2) + 1
+    between = (pixels[:-1] + pixels[1:]) // 2
+    out[pixels[:, 0], pixels[:, 1]] = 1
+    out[between[:, 0], between[:, 1]] = 1
+
+    return out
+
+def get_hole(maze: Maze, indices: tuple[int]):
+    """
+    Get the pixel indices of the hole in the outer walls of the maze, next to the cell at the given indices.
+
+    Args:
+        maze (Maze): The maze object.
+        indices (tuple[int]): The row and column indices of a cell on the edge of the maze.
+
+    Returns:
+        tuple[int]: The (row, col) pixel indices of the hole, or None if the cell is not on the edge.
+    """
+    row, col = indices
+    if row == 0:
+        return (0, 2*col+1)
+    if row == maze.rows - 1:
+        return (2*maze.rows, 2*col+1)
+    if col == 0:
+        return (2*row+1, 0)
+    if col == maze.cols - 1:
+        return (2*row+1, 2*maze.cols)
+    return None
+
+def walls_to_npy(grid: np.ndarray, out: np.ndarray = None):
+    """
+    Convert a wall grid (see Maze.grid) to a numpy array of pixels, without holes in the outer walls.
+
+    Works on a single (rows, cols) grid, or on a stack of grids (..., rows, cols).
+    A pixel between two cells is a wall only if both cells have a wall on that side.
+
+    Args:
+        grid (np.ndarray): The uint8 wall grid(s).
+        out (np.ndarray): Optional (..., 2*rows+1, 2*cols+1) array to write the pixels into.
 
-def maze_to_npy(maze: Maze, return_holes: bool = False):
+    Returns:
+        np.ndarray: The maze(s) as a uint8 numpy array.
+    """
+    rows, cols = grid.shape[-2:]
+    if out is None:
+        out = np.empty(grid.shape[:-2] + (2*rows+1, 2*cols+1), dtype=np.uint8)
+
+    # Start with all walls, and open the cell centers
+    out[...] = 1
+    out[..., 1::2, 1::2] = 0
+
+    # Knock out the walls between cells
+    out[..., 0:-1:2, 1::2] &= (grid & N) != 0
+    out[..., 2::2, 1::2] &= (grid & S) != 0
+    out[..., 1::2, 2::2] &= (grid & E) != 0
+    out[..., 1::2, 0:-1:2] &= (grid & W) != 0
+
+    return out
+
+def maze_to_npy(maze: Maze, return_holes: bool = False, out: np.ndarray = None):
     """
     Convert a maze object to a numpy array.
 
     Args:
         maze (Maze): The maze object to convert.
         return_holes (bool): Whether to return the holes in the outer walls of the maze.
+        out (np.ndarray): Optional (2*rows+1, 2*cols+1) array to write the maze into, e.g. a slice of a preallocated batch.
     
     Returns:
-        np.ndarray: The maze object as a numpy array.
+        np.ndarray: The maze object as a uint8 numpy array.
         optional: list[tuple[int]]: The holes in the outer walls of the maze.
     """
-    # Add walls around each cell in the maze
-    rows = (maze.rows * 2) + 1
-    cols = (maze.cols * 2) + 1
-    maze_array = np.ones((rows, cols), dtype=int)
-    # All indices i,j that are both not divisible by 2 are empty cells
-    maze_array[1::2, 1::2] = 0
-
-    # Break a wall around the start cell
-    start_row, start_col = maze.start_indices
-    if start_row == 0:
-        start_hole = (0, 2*start_col+1)
-        maze_array[0, 2*start_col+1] = 0
-    elif start_row == maze.rows - 1:
-        start_hole = (2*maze.rows, 2*start_col+1)
-        maze_array[2*maze.rows, 2*start_col+1] = 0
-    elif start_col == 0:
-        start_hole = (2*start_row+1, 0)
-        maze_array[2*start_row+1, 0] = 0
-    elif start_col == maze.cols - 1:
-        start_hole = (2*start_row+1, 2*maze.cols)
-        maze_array[2*start_row+1, 2*maze.cols] = 0
-
-    # Break a wall around the target cell
-    target_row, target_col = maze.target_indices
-    if target_row == 0:
-        target_hole = (0, 2*target_col+1)
-        maze_array[0, 2*target_col+1] = 0
-    elif target_row == maze.rows - 1:
-        target_hole = (2*maze.rows, 2*target_col+1)
-        maze_array[2*maze.rows, 2*target_col+1] = 0
-    elif target_col == 0:
-        target_hole = (2*target_row+1, 0)
-        maze_array[2*target_row+1, 0] = 0
-    elif target_col == maze.cols - 1:
-        target_hole = (2*target_row+1, 2*maze.cols)
-        maze_array[2*target_row+1, 2*maze.cols] = 0
-    
-    # iterate over cell indices and cells
-    for i, row in enumerate(maze.cells):
-        for j, cell in enumerate(row):
-            # Add walls to the maze array
-            if not cell.walls['N']:
-                maze_array[2*i, 2*j+1] = 0
-            if not cell.walls['S']:
-                maze_array[2*i+2, 2*j+1] = 0
-            if not cell.walls['E']:
-                maze_array[2*i+1, 2*j+2] = 0
-            if not cell.walls['W']:
-                maze_array[2*i+1, 2*j] = 0
+    maze_array = walls_to_npy(maze.grid, out=out)
+
+    # Break a wall around the start and target cells
+    start_hole = get_hole(maze, maze.start_indices)
+    target_hole = get_hole(maze, maze.target_indices)
+    for hole in (start_hole, target_hole):
+        if hole is not None:
+            maze_array[hole] = 0
     
     if return_holes:
         return maze_array, [start_hole, target_hole]
     
     return maze_array
 
-def create_dataset(n_samples, maze_size, generator=Wilson):
+def get_sample_rng(seed, index):
+    """
+    Get the random number generator of a single sample of a seeded dataset.
+
+    The generator is seeded with the child index of the root seed sequence (the same as SeedSequence(seed).spawn(index + 1)[index]),
+    so any sample can be recreated from the root seed and its index alone.
+
+    Args:
+        seed (int): The root seed of the dataset.
+        index (int): The index of the sample.
+
+    Returns:
+        np.random.Generator: The random number generator of the sample.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+
+def get_endpoints(maze_size, rng=None):
+    """
+    Pick start/target indices somewhere along opposite edges of a maze.
+
+    Args:
+        maze_size (int): The size of the maze.
+        rng (np.random.Generator): The random number generator. Defaults to the global np.random state.
+
+    Returns:
+        tuple[tuple[int]]: The start and target indices.
+    """
+    rng = np.random if rng is None else rng
+    first, second = (int(draw * maze_size) for draw in rng.random(2))
+    # Ensure that the start and target cells are not on the same edge
+    if rng.random() < 0.5:
+        return (first, 0), (second, maze_size - 1)
+    return (0, first), (maze_size - 1, second)
+
+def create_maze(maze_size, generator=Wilson, rng=None, maze=None):
+    """
+    Generate a single maze with its start/target cells on opposite edges.
+
+    Args:
+        maze_size (int): The size of the maze.
+        generator (type): The maze generator to use.
+        rng (np.random.Generator): The random number generator, for the endpoints and the generator. Defaults to the global np.random state.
+        maze (Maze): Optional maze_size x maze_size maze to reset (see Maze.reset) and generate in, instead of a new Maze.
+
+    Returns:
+        Maze: The generated maze.
+    """
+    start_indices, target_indices = get_endpoints(maze_size, rng)
+    if maze is None:
+        return Maze(maze_size, maze_size, start_indices=start_indices, target_indices=target_indices, generator=generator, rng=rng)
+    maze.reset(start_indices, target_indices)
+    generator.generate(maze, rng)
+    return maze
+
+def iter_mazes(n_samples, maze_size, generator=Wilson, batch_size=1024, seed=None, start=0, reuse_maze=False, progress=True):
+    """
+    Generate mazes with their start/target cells on opposite edges, one at a time.
+
+    If the generator is vectorized, the walls are generated batch_size mazes at a time with generator.generate_batch.
+    If a seed is given, every maze is generated with its own random number generator (see get_sample_rng) instead,
+    so that maze start+i only depends on the seed and its index.
+
+    Args:
+        n_samples (int): The number of mazes to generate.
+        maze_size (int): The size of the maze.
+        generator (type): The maze generator to use.
+        batch_size (int): The number of mazes per generate_batch call, for vectorized generators.
+        seed (int): The root seed of the dataset. Defaults to None (the global np.random state).
+        start (int): The index of the first maze in the seeded dataset.
+        reuse_maze (bool): Whether to generate every maze in the same Maze object (reset in-place), so that the loop
+            allocates no new mazes. The yielded maze is then only valid until the next one is generated.
+        progress (bool): Whether to show a progress bar over the mazes.
+
+    Yields:
+        Maze: The generated mazes.
+    """
+    walls = None
+    maze = Maze(maze_size, maze_size) if reuse_maze else None
+    for i in trange(n_samples, disable=not progress):
+        if seed is not None:
+            yield create_maze(maze_size, generator, get_sample_rng(seed, start + i), maze)
+        elif generator.vectorized:
+            if i % batch_size == 0:
+                walls = generator.generate_batch(min(batch_size, n_samples - i), maze_size, maze_size)
+            start_indices, target_indices = get_endpoints(maze_size)
+            if maze is None:
+                yield Maze.from_walls(walls[i % batch_size], start_indices=start_indices, target_indices=target_indices)
+            else:
+                maze.reset(start_indices, target_indices)
+                maze.set_walls(walls[i % batch_size])
+                yield maze
+        else:
+            yield create_maze(maze_size, generator, maze=maze)
+
+def create_sample(maze, solver, out=None):
+    """
+    Convert a maze and its solution to a (maze_array, path_array) sample.
+
+    Args:
+        maze (Maze): The maze.
+        solver (ISolver): The solver to find the path with.
+        out (np.ndarray): Optional (2, 2*rows+1, 2*cols+1) array to write the maze and path arrays into.
+
+    Returns:
+        tuple[np.ndarray]: The maze array and the path array.
+    """
+    maze_array, holes = maze_to_npy(maze, return_holes=True, out=None if out is None else out[0])
+
+    path = solver.solve(maze)
+    path_array = path_to_npy(path, maze_array, holes, out=None if out is None else out[1])
+
+    return maze_array, path_array
+
+def get_endpoint_pairs(maze_size, n_pairs, rng=None):
+    """
+    Pick distinct start/target index pairs along opposite edges of a maze (the rule of get_endpoints).
+
+    Codes 0..n**2-1 are the left/right pairs ((first, 0), (second, n-1)), and codes n**2..2*n**2-1 the top/bottom
+    pairs ((0, first), (n-1, second)). Two top/bottom pairs join the same corners as a left/right pair: (0, n-1)
+    is the left/right (0, n-1) pair, and (n-1, 0) is the left/right (n-1, 0) pair reversed. Without them there are
+    2 * maze_size**2 - 2 distinct pairs, which are sampled uniformly without replacement.
+
+    Args:
+        maze_size (int): The size of the maze.
+        n_pairs (int): The number of pairs to pick.
+        rng (np.random.Generator): The random number generator. Defaults to the global np.random state.
+
+    Returns:
+        list[tuple[tuple[int]]]: The (start_indices, target_indices) pairs.
+    """
+    rng = np.random if rng is None else rng
+    # Top/bottom codes of the corner pairs, which are also left/right pairs (a single code for a 1x1 maze)
+    duplicates = sorted({maze_size**2 + maze_size - 1, maze_size**2 + (maze_size - 1) * maze_size})
+    n_codes = 2 * maze_size**2 - len(duplicates)
+    if n_pairs > n_codes:
+        raise ValueError(f'A {maze_size}x{maze_size} maze only has {n_codes} distinct endpoint pairs.')
+    codes = rng.choice(n_codes, size=n_pairs, replace=False).tolist()
+    pairs = []
+    for code in codes:
+        # Skip over the duplicate codes
+        for duplicate in duplicates:
+            code += code >= duplicate
+        vertical, (first, second) = code // maze_size**2, divmod(code % maze_size**2, maze_size)
+        if vertical:
+            pairs.append(((0, first), (maze_size - 1, second)))
+        else:
+            pairs.append(((first, 0), (second, maze_size - 1)))
+    return pairs
+
+def create_pair_samples(maze, endpoint_pairs, out=None):
+    """
+    Convert a (perfect) maze and several start/target pairs to samples that share the walls of the maze.
+
+    The maze is converted to pixels once, and all paths are read from a single TreePathIndex of the maze.
+
+    Args:
+        maze (Maze): The maze.
+        endpoint_pairs (list[tuple[tuple[int]]]): The K (start_indices, target_indices) pairs.
+        out (np.ndarray): Optional (K, 2, 2*rows+1, 2*cols+1) array to write the samples into.
+
+    Returns:
+        np.ndarray: The (K, 2, 2*rows+1, 2*cols+1) samples.
+    """
+    if out is None:
+        out = np.empty((len(endpoint_pairs), 2, 2*maze.rows+1, 2*maze.cols+1), dtype=np.uint8)
+    walls_to_npy(maze.grid, out=out[0, 0])
+    out[1:, 0] = out[0, 0]
+
+    index = TreePathIndex(maze)
+    for sample, (start_indices, target_indices) in zip(out, endpoint_pairs):
+        holes = [get_hole(maze, start_indices), get_hole(maze, target_indices)]
+        for hole in holes:
+            sample[0][hole] = 0
+        path_to_npy(index.path_indices(start_indices, target_indices), sample[0], holes, out=sample[1])
+    return out
+
+def iter_pair_samples(n_samples, maze_size, generator=Wilson, pairs_per_maze=2, seed=None, start=0, progress=True):
+    """
+    Generate samples with pairs_per_maze distinct start/target pairs per maze, one sample at a time.
+
+    Sample i belongs to maze i // pairs_per_maze. If a seed is given, that maze and its endpoint pairs
+    only depend on the seed and the maze index (see get_sample_rng), so any range of samples can be recreated.
+
+    Args:
+        n_samples (int): The number of samples to generate.
+        maze_size (int): The size of the maze.
+        generator (type): The maze generator to use.
+        pairs_per_maze (int): The number of start/target pairs (and samples) per maze.
+        seed (int): The root seed of the dataset. Defaults to None (the global np.random state).
+        start (int): The index of the first sample in the seeded dataset.
+        progress (bool): Whether to show a progress bar over the mazes.
+
+    Yields:
+        np.ndarray: The (2, 2*maze_size+1, 2*maze_size+1) samples. They are only valid until the next maze is generated.
+    """
+    pixels = 2 * maze_size + 1
+    samples = np.empty((pairs_per_maze, 2, pixels, pixels), dtype=np.uint8)
+    maze = Maze(maze_size, maze_size)
+    stop = start + n_samples
+    for maze_index in trange(start // pairs_per_maze, -(-stop // pairs_per_maze), disable=not progress):
+        rng = None if seed is None else get_sample_rng(seed, maze_index)
+        endpoint_pairs = get_endpoint_pairs(maze_size, pairs_per_maze, rng)
+        # generate from the first pair's endpoints (RandomizedDFS starts from the start cell)
+        maze.reset(*endpoint_pairs[0])
+        generator.generate(maze, rng)
+        create_pair_samples(maze, endpoint_pairs, out=samples)
+
+        first = maze_index * pairs_per_maze
+        for sample in samples[max(start, first) - first:min(stop, first + pairs_per_maze) - first]:
+            yield sample
+
+def iter_dataset(n_samples, maze_size, generator=Wilson, chunk_size=None, batch_size=1024, seed=None, start=0, pairs_per_maze=1):
+    """
+    Create a dataset of mazes and their solutions as a stream, so that memory stays flat for any n_samples.
+
+    Args:
+        n_samples (int): The number of samples to create.
+        maze_size (int): The size of the maze.
+        generator (type): The maze generator to use.
+        chunk_size (int): If given, yield (k, 2, 2*maze_size+1, 2*maze_size+1) chunks of (at most) chunk_size samples, instead of single samples.
+        batch_size (int): The number of mazes per generate_batch call, for vectorized generators.
+        seed (int): The root seed of the dataset, see iter_mazes. Defaults to None (the global np.random state).
+        start (int): The index of the first sample in the seeded dataset.
+        pairs_per_maze (int): The number of start/target pairs per maze, see iter_pair_samples.
+
+    Yields:
+        tuple[np.ndarray] | np.ndarray: The (maze_array, path_array) samples, or chunks of samples.
+    """
+    solver = ASolver()
+    pixels = 2 * maze_size + 1
+    chunk = None
+    if pairs_per_maze > 1:
+        for i, sample in enumerate(iter_pair_samples(n_samples, maze_size, generator, pairs_per_maze, seed, start)):
+            if chunk_size is None:
+                yield sample[0].copy(), sample[1].copy()
+                continue
+
+            if i % chunk_size == 0:
+                chunk = np.empty((min(chunk_size, n_samples - i), 2, pixels, pixels), dtype=np.uint8)
+            chunk[i % chunk_size] = sample
+            if i % chunk_size == len(chunk) - 1:
+                yield chunk
+        return
+
+    for i, maze in enumerate(iter_mazes(n_samples, maze_size, generator, batch_size, seed, start, reuse_maze=True)):
+        if chunk_size is None:
+            yield create_sample(maze, solver)
+            continue
+
+        if i % chunk_size == 0:
+            chunk = np.empty((min(chunk_size, n_samples - i), 2, pixels, pixels), dtype=np.uint8)
+        create_sample(maze, solver, out=chunk[i % chunk_size])
+        if i % chunk_size == len(chunk) - 1:
+            yield chunk
+
+def create_dataset(n_samples, maze_size, generator=Wilson, batch_size=1024, out=None, seed=None, start=0, pairs_per_maze=1, progress=True):
     """
     Create a dataset of mazes and their solutions.
 
@@ -136,29 +398,121 @@ def create_dataset(n_samples, maze_size, generator=Wilson):
         n_samples (int): The number of samples to create.
         maze_size (int): The size of the maze.
         generator (type): The maze generator to use.
+        batch_size (int): The number of mazes per generate_batch call, for vectorized generators.
+        out (np.ndarray): Optional (n_samples, 2, 2*maze_size+1, 2*maze_size+1) array (e.g. a memmap) to write the samples into.
+        seed (int): The root seed of the dataset, see iter_mazes. Defaults to None (the global np.random state).
+        start (int): The index of the first sample in the seeded dataset.
+        pairs_per_maze (int): The number of start/target pairs per maze, see iter_pair_samples.
+        progress (bool): Whether to show a progress bar, e.g. False in worker processes.
+
+    Returns:
+        list[tuple[np.ndarray]]: The (maze_array, path_array) samples, or out if it is given.
     """
     dataset = []
+    if pairs_per_maze > 1:
+        for i, sample in enumerate(iter_pair_samples(n_samples, maze_size, generator, pairs_per_maze, seed, start, progress)):
+            if out is None:
+                dataset.append((sample[0].copy(), sample[1].copy()))
+            else:
+                out[i] = sample
+        return dataset if out is None else out
+
     solver = ASolver()
-    for i in trange(n_samples):
-        # pick start/target indices somewhere along the edges of the maze
-        # Ensure that the start and target cells are not on the same edge
-        if np.random.rand() < 0.5:
-            start_indices = (np.random.randint(maze_size), 0)
-            target_indices = (np.random.randint(maze_size), maze_size - 1)
-        else:
-            start_indices = (0, np.random.randint(maze_size))
-            target_indices = (maze_size - 1, np.random.randint(maze_size))
+    for i, maze in enumerate(iter_mazes(n_samples, maze_size, generator, batch_size, seed, start, reuse_maze=True, progress=progress)):
+        sample = create_sample(maze, solver, out=None if out is None else out[i])
+        if out is None:
+            dataset.append(sample)
 
-        maze = Maze(maze_size, maze_size, start_indices=start_indices, target_indices=target_indices, generator=generator)
-        maze_array, holes = maze_to_npy(maze, return_holes=True)
+    return dataset if out is None else out
 
-        path = solver.solve(maze)
-        path_array = path_to_npy(path, maze_array, holes)
+def create_chunk(start, stop, maze_size, generator, seed, pairs_per_maze=1):
+    """
+    Create the samples start..stop-1 of a seeded dataset (in a worker process of write_dataset).
 
-        # convert maze_array, path_array to uint8 arrays
-        maze_array = maze_array.astype(np.uint8)
-        path_array = path_array.astype(np.uint8)
+    Args:
+        start (int): The index of the first sample.
+        stop (int): The index after the last sample.
+        maze_size (int): The size of the maze.
+        generator (IGenerator): The maze generator to use.
+        seed (int): The root seed of the dataset, see get_sample_rng.
+        pairs_per_maze (int): The number of start/target pairs per maze, see iter_pair_samples.
+
+    Returns:
+        np.ndarray: The (stop-start, 2, 2*maze_size+1, 2*maze_size+1) samples.
+    """
+    pixels = 2 * maze_size + 1
+    chunk = np.empty((stop - start, 2, pixels, pixels), dtype=np.uint8)
+    if pairs_per_maze > 1:
+        for i, sample in enumerate(iter_pair_samples(stop - start, maze_size, generator, pairs_per_maze, seed, start, progress=False)):
+            chunk[i] = sample
+        return chunk
+
+    solver = ASolver()
+    maze = Maze(maze_size, maze_size)
+    for i in range(start, stop):
+        create_sample(create_maze(maze_size, generator, get_sample_rng(seed, i), maze), solver, out=chunk[i - start])
+    return chunk
+
+def write_dataset(writer, n_samples, maze_size, generator=Wilson, workers=None, chunk_size=1024, seed=None, queue_size=4, pairs_per_maze=1):
+    """
+    Create a dataset with a pipeline of worker processes and a writer thread.
+
+    Worker processes create chunks of samples (generate, convert and solve) in parallel. The finished chunks are put,
+    in order, on a bounded queue, from which a writer thread appends them to the writer. When the writer falls
+    behind, the queue fills up and no new chunks are submitted (back-pressure), so memory stays bounded.
+
+    Args:
+        writer (DatasetWriter): The writer to append the (k, 2, 2*maze_size+1, 2*maze_size+1) chunks to.
+        n_samples (int): The number of samples to create.
+        maze_size (int): The size of the maze.
+        generator (IGenerator): The maze generator to use.
+        workers (int): The number of worker processes. Defaults to the number of CPUs.
+        chunk_size (int): The number of samples per chunk.
+        seed (int): The root seed of the dataset, see get_sample_rng. Defaults to a fresh seed.
+        queue_size (int): The number of finished chunks that can wait for the writer.
+        pairs_per_maze (int): The number of start/target pairs per maze, see iter_pair_samples.
+
+    Returns:
+        int: The root seed of the dataset.
+    """
+    seed = np.random.SeedSequence().entropy if seed is None else seed
+    workers = os.cpu_count() if workers is None else workers
+    bounds = list(range(0, n_samples, chunk_size)) + [n_samples]
+    chunk_queue = queue.Queue(maxsize=queue_size)
+    errors = []
 
-        dataset.append((maze_array, path_array))
+    def write_chunks():
+        with tqdm(total=n_samples) as progress:
+            while (chunk := chunk_queue.get()) is not None:
+                if not errors:
+                    try:
+                        writer.append(chunk)
+                    except Exception as error:
+                        errors.append(error)
+                progress.update(len(chunk))
 
-    return dataset
\ No newline at end of file
+    writer_thread = threading.Thread(target=write_chunks, daemon=True)
+    writer_thread.start()
+    try:
+        # spawn (instead of fork) the workers, since they start while the writer thread may hold locks
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            # keep every worker busy, with one chunk queued behind it
+            max_pending = 2 * workers
+            pending = deque()
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                if errors:
+                    break
+                pending.append(pool.submit(create_chunk, start, stop, maze_size, generator, seed, pairs_per_maze))
+                if len(pending) >= max_pending:
+                    # blocks while the queue is full
+                    chunk_queue.put(pending.popleft().result())
+            while pending and not errors:
+                chunk_queue.put(pending.popleft().result())
+            for future in pending:
+                future.cancel()
+    finally:
+        chunk_queue.put(None)
+        writer_thread.join()
+    if errors:
+        raise errors[0]
+    return seed
@@ -0,0 +1,80 @@
+import numpy as np
+import struct
+
+
+class DatasetWriter:
+    """
+    Append chunks of samples to a .npy file as they are produced.
+
+    The .npy header is written with enough padding to hold any sample count, and is rewritten
+    (in-place) after every chunk. The file on disk is therefore always a valid .npy file holding
+    every chunk appended so far, even if the process dies halfway.
+    """
+    def __init__(self, filename:str, sample_shape:tuple, dtype=np.uint8) -> None:
+        """
+        Create (or truncate) the output file.
+
+        Args:
+            filename (str): The .npy file to write.
+            sample_shape (tuple): The shape of a single sample, e.g. (2, 2*maze_size+1, 2*maze_size+1).
+            dtype (np.dtype): The dtype of the samples.
+        """
+        self.filename = filename
+        self.sample_shape = tuple(sample_shape)
+        self.dtype = np.dtype(dtype)
+        self.n_samples = 0
+        # Reserve room in the header for the largest possible sample count
+        self.header_size = len(self.get_header(np.iinfo(np.int64).max))
+
+        self.file = open(filename, 'wb+')
+        self.file.write(self.get_header(0, self.header_size))
+        self.file.flush()
+
+    def get_header(self, n_samples:int, header_size:int=None) -> bytes:
+        """
+        Get the .npy (version 1.0) header for the given sample count.
+
+        Args:
+            n_samples (int): The number of samples in the file.
+            header_size (int): The total size to pad the header to. Defaults to the next multiple of 64 bytes.
+
+        Returns:
+            bytes: The header.
+        """
+        header = repr({'descr': np.lib.format.dtype_to_descr(self.dtype), 'fortran_order': False,
+                       'shape': (n_samples,) + self.sample_shape})
+        prefix_size = len(np.lib.format.magic(1, 0)) + 2
+        # Pad with spaces (and a final newline)
+        if header_size is None:
+            header_size = -(-(prefix_size + len(header) + 1) // 64) * 64
+        header = header.ljust(header_size - prefix_size - 1) + '\n'
+        return np.lib.format.magic(1, 0) + struct.pack('<H', len(header)) + header.encode('latin1')
+
+    def append(self, samples) -> None:
+        """
+        Append a chunk of samples to the file, and update the sample count in the header.
+
+        Args:
+            samples (np.ndarray | list): A (k, *sample_shape) array, or a list of k samples (e.g. (maze_array, path_array) tuples).
+        """
+        samples = np.asarray(samples, dtype=self.dtype).reshape((-1,) + self.sample_shape)
+        self.file.seek(0, 2)
+        self.file.write(np.ascontiguousarray(samples).tobytes())
+        self.n_samples += len(samples)
+        # Only count the chunk in the header after its data is written
+        self.file.flush()
+        self.file.seek(0)
+        self.file.write(self.get_header(self.n_samples, self.header_size))
+        self.file.flush()
+
+    def close(self) -> None:
+        """
+        Close the output file.
+        """
+        self.file.close()
+
+    def __enter__(self) -> 'DatasetWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
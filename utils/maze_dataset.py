@@ -0,0 +1,116 @@
+from .shards import ShardedDataset
+
+import numpy as np
+import os
+import queue
+import threading
+
+
+class MazeDataset:
+    """
+    Memory-mapped reader for the (N, 2, H, W) .npy datasets written by create_dataset.py, and the sharded datasets written by create_datasets.py.
+
+    Samples are only read from disk when they are accessed, so the resident set stays small
+    even for datasets that don't fit in RAM.
+    """
+    def __init__(self, filename:str) -> None:
+        """
+        Open the dataset.
+
+        Args:
+            filename (str): The .npy file, or the directory of a sharded dataset, to read.
+        """
+        self.filename = filename
+        self.data = ShardedDataset(filename) if os.path.isdir(filename) else np.load(filename, mmap_mode='r')
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index):
+        """
+        Read the samples at the given index, slice or index array.
+
+        Args:
+            index (int | slice | np.ndarray): The samples to read.
+
+        Returns:
+            np.ndarray: The (2, H, W) sample, or (k, 2, H, W) samples, in memory.
+        """
+        return np.array(self.data[index])
+
+    def get_batch(self, indices:np.ndarray):
+        """
+        Read a batch of samples, in increasing index order to keep the disk reads sequential.
+
+        Args:
+            indices (np.ndarray): The indices of the samples.
+
+        Returns:
+            tuple[np.ndarray]: The (k, H, W) mazes and the (k, H, W) paths.
+        """
+        batch = self.data[np.sort(indices)]
+        return batch[:, 0], batch[:, 1]
+
+    def iter_batches(self, batch_size:int, shuffle:bool=True, drop_last:bool=False, prefetch:int=2, rng=None):
+        """
+        Iterate over the dataset in (maze, path) batches, read ahead on a background thread.
+
+        While a batch is being used, the next `prefetch` batches are read from disk, so disk reads
+        overlap with the compute on the current batch (numpy releases the GIL while copying).
+
+        Args:
+            batch_size (int): The number of samples per batch.
+            shuffle (bool): Whether to draw the samples of each batch at random, without replacement.
+            drop_last (bool): Whether to skip the last batch if it has less than batch_size samples.
+            prefetch (int): The number of batches to read ahead. 0 reads every batch when it is requested.
+            rng (np.random.Generator): The random number generator for the shuffling. Defaults to the global numpy random state.
+
+        Yields:
+            tuple[np.ndarray]: The (k, H, W) mazes and the (k, H, W) paths.
+        """
+        rng = np.random if rng is None else rng
+        order = rng.permutation(len(self)) if shuffle else np.arange(len(self))
+        stop = len(order) - len(order) % batch_size if drop_last else len(order)
+        batches = [order[start:start + batch_size] for start in range(0, stop, batch_size)]
+
+        if prefetch <= 0:
+            for indices in batches:
+                yield self.get_batch(indices)
+            return
+
+        batch_queue = queue.Queue(maxsize=prefetch)
+        done = threading.Event()
+
+        def put(item) -> bool:
+            # wait for room in the queue, unless the iteration was abandoned
+            while not done.is_set():
+                try:
+                    batch_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def read_batches():
+            try:
+                for indices in batches:
+                    if not put(self.get_batch(indices)):
+                        return
+            except Exception as error:
+                put(error)
+                return
+            put(None)
+
+        reader = threading.Thread(target=read_batches, daemon=True)
+        reader.start()
+        try:
+            while True:
+                batch = batch_queue.get()
+                if batch is None:
+                    break
+                if isinstance(batch, Exception):
+                    raise batch
+                yield batch
+        finally:
+            done.set()
+            reader.join()
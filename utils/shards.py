@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def get_shard_path(directory:str, shard:int) -> str:
+    """
+    Get the path of a numbered shard of a sharded dataset.
+
+    Args:
+        directory (str): The directory of the sharded dataset.
+        shard (int): The index of the shard.
+
+    Returns:
+        str: The path of the shard's .npy file.
+    """
+    return os.path.join(directory, f'shard_{shard:05d}.npy')
+
+def get_checksum(filename:str, block_size:int=1 << 24) -> str:
+    """
+    Get the SHA-256 checksum of a file, reading it in blocks.
+
+    Args:
+        filename (str): The file to checksum.
+        block_size (int): The number of bytes to read at a time.
+
+    Returns:
+        str: The hex digest of the file.
+    """
+    checksum = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        while block := file.read(block_size):
+            checksum.update(block)
+    return checksum.hexdigest()
+
+def load_manifest(directory:str):
+    """
+    Load the manifest of a sharded dataset.
+
+    The manifest holds the config of the dataset (including its root seed), and for every completed shard
+    its sample range and checksum.
+
+    Args:
+        directory (str): The directory of the sharded dataset.
+
+    Returns:
+        dict: The manifest, or None if the directory has no manifest yet.
+    """
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+def save_manifest(directory:str, manifest:dict) -> None:
+    """
+    Save the manifest of a sharded dataset, atomically (an interrupted save leaves the previous manifest).
+
+    Args:
+        directory (str): The directory of the sharded dataset.
+        manifest (dict): The manifest.
+    """
+    path = os.path.join(directory, MANIFEST_NAME)
+    with open(path + '.tmp', 'w') as file:
+        json.dump(manifest, file, indent=4)
+    os.replace(path + '.tmp', path)
+
+
+class ShardedDataset:
+    """
+    The shards of a complete sharded dataset (see create_datasets.py), as one logical (N, 2, H, W) dataset.
+
+    Every shard is memory-mapped and samples are read from the shards they live in, so nothing is copied
+    until it is indexed. Can be used as the data of MazeDataset.
+    """
+    def __init__(self, directory:str) -> None:
+        """
+        Open the shards of a sharded dataset, in sample order.
+
+        Args:
+            directory (str): The directory of the sharded dataset.
+        """
+        manifest = load_manifest(directory)
+        if manifest is None:
+            raise FileNotFoundError(f'No {MANIFEST_NAME} in {directory}.')
+        shards = sorted(manifest['shards'].items(), key=lambda item: item[1]['start'])
+        if sum(shard['stop'] - shard['start'] for _, shard in shards) != manifest['config']['num_mazes']:
+            raise ValueError(f'{directory} is incomplete, re-run create_datasets.py to create the missing shards.')
+        self.directory = directory
+        self.shards = [np.load(get_shard_path(directory, int(shard)), mmap_mode='r') for shard, _ in shards]
+        # Start of every shard in the logical dataset
+        self.offsets = np.concatenate([[0], np.cumsum([len(shard) for shard in self.shards])])
+        self.shape = (int(self.offsets[-1]),) + (self.shards[0].shape[1:] if self.shards else ())
+        self.dtype = self.shards[0].dtype if self.shards else np.dtype(np.uint8)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, index):
+        """
+        Read the samples at the given index, slice or index array.
+
+        Args:
+            index (int | slice | np.ndarray): The samples to read.
+
+        Returns:
+            np.ndarray: The (2, H, W) sample (a view on its shard), or a (k, 2, H, W) array of samples.
+        """
+        if np.isscalar(index):
+            index = int(index) + len(self) if index < 0 else int(index)
+            if not 0 <= index < len(self):
+                raise IndexError(f'index {index} is out of range for a dataset of {len(self)} samples.')
+            shard = np.searchsorted(self.offsets, index, side='right') - 1
+            return self.shards[shard][index - self.offsets[shard]]
+
+        indices = np.arange(*index.indices(len(self))) if isinstance(index, slice) else np.asarray(index).ravel()
+        indices = np.where(indices < 0, indices + len(self), indices)
+        out = np.empty((len(indices),) + self.shape[1:], dtype=self.dtype)
+        shard_ids = np.searchsorted(self.offsets, indices, side='right') - 1
+        # one (fancy-indexed) read per shard
+        for shard in np.unique(shard_ids):
+            mask = shard_ids == shard
+            out[mask] = self.shards[shard][indices[mask] - self.offsets[shard]]
+        return out
@@ -0,0 +1,138 @@
+from .create_dataset import create_maze, create_sample, create_pair_samples, get_endpoint_pairs, get_sample_rng
+from generators import Wilson
+from maze import Maze
+from solvers.ASolver import ASolver
+
+from functools import lru_cache
+import numpy as np
+
+
+class VirtualDataset:
+    """
+    Dataset of (maze, path) samples that are regenerated on demand from a root seed, instead of being stored.
+
+    Sample i is generated with its own random number generator (see get_sample_rng), so it is the same
+    sample as index i of create_dataset(..., seed=seed, pairs_per_maze=pairs_per_maze), on any worker and in any order.
+    Recently used samples (or, with several pairs per maze, the samples of recently used mazes) are kept in an LRU cache.
+    The caches are built on first use and are not pickled, so the dataset can be sent to worker processes.
+    """
+    def __init__(self, n_samples:int, maze_size:int, generator=Wilson(), seed:int=0, cache_size:int=1024, pairs_per_maze:int=1) -> None:
+        """
+        Initialize the virtual dataset.
+
+        Args:
+            n_samples (int): The number of samples in the dataset.
+            maze_size (int): The size of the mazes.
+            generator (IGenerator): The maze generator to use.
+            seed (int): The root seed of the dataset.
+            cache_size (int): The number of samples (or mazes, with several pairs per maze) to keep in the LRU cache.
+            pairs_per_maze (int): The number of start/target pairs per maze, see iter_pair_samples.
+        """
+        self.n_samples = n_samples
+        self.maze_size = maze_size
+        self.generator = generator
+        self.seed = seed
+        self.pairs_per_maze = pairs_per_maze
+        self.cache_size = cache_size
+        self.solver = ASolver()
+        # every sample is generated in the same (reset) maze
+        self.maze = Maze(maze_size, maze_size)
+        self.sample_cache = None
+        self.maze_cache = None
+
+    def __getstate__(self) -> dict:
+        # the caches hold bound methods of this dataset, so they are rebuilt after unpickling
+        state = self.__dict__.copy()
+        state['sample_cache'] = state['maze_cache'] = None
+        return state
+
+    def get_sample(self, index:int) -> np.ndarray:
+        """
+        Get a sample through the LRU cache.
+
+        Args:
+            index (int): The index of the sample.
+
+        Returns:
+            np.ndarray: The read-only (2, 2*maze_size+1, 2*maze_size+1) sample.
+        """
+        if self.sample_cache is None:
+            self.sample_cache = lru_cache(maxsize=self.cache_size)(self.create_sample)
+        return self.sample_cache(index)
+
+    def get_maze_samples(self, maze_index:int) -> np.ndarray:
+        """
+        Get the samples of a maze with several start/target pairs through the LRU cache.
+
+        Args:
+            maze_index (int): The index of the maze.
+
+        Returns:
+            np.ndarray: The read-only (pairs_per_maze, 2, 2*maze_size+1, 2*maze_size+1) samples.
+        """
+        if self.maze_cache is None:
+            self.maze_cache = lru_cache(maxsize=self.cache_size)(self.create_maze_samples)
+        return self.maze_cache(maze_index)
+
+    def create_sample(self, index:int) -> np.ndarray:
+        """
+        Generate a sample (without the cache).
+
+        Args:
+            index (int): The index of the sample.
+
+        Returns:
+            np.ndarray: The read-only (2, 2*maze_size+1, 2*maze_size+1) sample.
+        """
+        pixels = 2 * self.maze_size + 1
+        sample = np.empty((2, pixels, pixels), dtype=np.uint8)
+        maze = create_maze(self.maze_size, self.generator, get_sample_rng(self.seed, index), self.maze)
+        create_sample(maze, self.solver, out=sample)
+        # the sample is shared by every lookup through the cache
+        sample.flags.writeable = False
+        return sample
+
+    def create_maze_samples(self, maze_index:int) -> np.ndarray:
+        """
+        Generate the samples of a maze with several start/target pairs (without the cache).
+
+        Args:
+            maze_index (int): The index of the maze.
+
+        Returns:
+            np.ndarray: The read-only (pairs_per_maze, 2, 2*maze_size+1, 2*maze_size+1) samples.
+        """
+        rng = get_sample_rng(self.seed, maze_index)
+        endpoint_pairs = get_endpoint_pairs(self.maze_size, self.pairs_per_maze, rng)
+        self.maze.reset(*endpoint_pairs[0])
+        self.generator.generate(self.maze, rng)
+        samples = create_pair_samples(self.maze, endpoint_pairs)
+        samples.flags.writeable = False
+        return samples
+
+    def __len__(self) -> int:
+        return self.n_samples
+
+    def __getitem__(self, index):
+        """
+        Get the samples at the given index, slice or index array.
+
+        Args:
+            index (int | slice | np.ndarray): The samples to get.
+
+        Returns:
+            np.ndarray: The read-only (2, H, W) sample, or a (k, 2, H, W) array of samples.
+        """
+        if isinstance(index, slice):
+            return np.stack([self[i] for i in range(*index.indices(self.n_samples))])
+        if not np.isscalar(index):
+            return np.stack([self[int(i)] for i in np.asarray(index).ravel()])
+
+        index = int(index)
+        if index < 0:
+            index += self.n_samples
+        if not 0 <= index < self.n_samples:
+            raise IndexError(f'index {index} is out of range for a dataset of {self.n_samples} samples.')
+        if self.pairs_per_maze > 1:
+            return self.get_maze_samples(index // self.pairs_per_maze)[index % self.pairs_per_maze]
+        return self.get_sample(index)